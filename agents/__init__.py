@@ -1,10 +1,17 @@
 """Multi-agent framework agents package."""
 
+import importlib
+
 from .base_agent import BaseAgent
-from .architect import ArchitectAgent
-from .developer import DeveloperAgent
-from .reviewer import ReviewerAgent
-from .ux_ui import UXUIAgent
+
+# Agent classes are imported from their modules on first access, so importing
+# the package (or one agent) doesn't pull in every other agent's dependencies
+_LAZY_AGENTS = {
+    'ArchitectAgent': '.architect',
+    'DeveloperAgent': '.developer',
+    'ReviewerAgent': '.reviewer',
+    'UXUIAgent': '.ux_ui'
+}
 
 __all__ = [
     'BaseAgent',
@@ -12,4 +19,13 @@ __all__ = [
     'DeveloperAgent',
     'ReviewerAgent',
     'UXUIAgent'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module = _LAZY_AGENTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    agent_class = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = agent_class
+    return agent_class
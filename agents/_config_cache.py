@@ -0,0 +1,112 @@
+"""Process-wide cache for parsed configuration and manifest files."""
+
+from typing import Any, Callable, Dict, Mapping, Tuple
+from types import MappingProxyType
+import os
+import copy
+import json
+import tempfile
+import threading
+import yaml
+from collections import OrderedDict
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Parsed file contents keyed by (absolute path, parser), validated by mtime and size
+_PARSE_CACHE: "OrderedDict[Tuple[str, str], Tuple[int, int, Any]]" = OrderedDict()
+_PARSE_CACHE_MAX = 100
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
+def _shared_parse(file_path: str, parser: Callable[[str], Any]) -> Any:
+    """Parse a file, returning the cached object itself while the file is unchanged."""
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    key = (path, parser.__name__)
+
+    with _PARSE_CACHE_LOCK:
+        cached = _PARSE_CACHE.get(key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            _PARSE_CACHE.move_to_end(key)
+            return cached[2]
+
+    result = parser(path)
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[key] = (st.st_mtime_ns, st.st_size, result)
+        if len(_PARSE_CACHE) > _PARSE_CACHE_MAX:
+            _PARSE_CACHE.popitem(last=False)
+    return result
+
+
+def cached_parse(file_path: str, parser: Callable[[str], Any]) -> Any:
+    """Parse a file, reusing the previous result while its mtime and size are unchanged."""
+    # Callers may mutate what they get back, so never hand out the cached object
+    return copy.deepcopy(_shared_parse(file_path, parser))
+
+
+def _parse_yaml(path: str) -> Dict[str, Any]:
+    # Hand libyaml the raw bytes in one buffer rather than a text stream it
+    # has to pull from and decode chunk by chunk
+    with open(path, "rb") as f:
+        return yaml.load(f.read(), Loader=_YamlLoader)
+
+
+def _sidecar_path(path: str) -> str:
+    return path + ".json"
+
+
+def _parse_yaml_with_sidecar(path: str) -> Dict[str, Any]:
+    """Parse a YAML file, going through a JSON copy of it when one is still current.
+
+    The sidecar records the mtime and size of the YAML it was built from, so a
+    fresh process can skip the YAML parser entirely until the source changes.
+    """
+    st = os.stat(path)
+    sidecar = _sidecar_path(path)
+    try:
+        with open(sidecar, "rb") as f:
+            cached = json.loads(f.read())
+        if cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+            return cached["config"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    config = _parse_yaml(path)
+    try:
+        payload = json.dumps({"mtime_ns": st.st_mtime_ns, "size": st.st_size, "config": config},
+                             separators=(",", ":"))
+    except (TypeError, ValueError):
+        return config
+    # JSON quietly turns non-string keys into strings; only keep exact round-trips
+    if json.loads(payload)["config"] != config:
+        return config
+
+    # Each writer gets its own temp file, so concurrent refreshes never replace
+    # the sidecar with another writer's half-written copy
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(sidecar) or ".",
+                                         prefix=os.path.basename(sidecar) + ".",
+                                         suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            f.write(payload)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    return config
+
+
+def load_config(path: str) -> Mapping[str, Any]:
+    """Load a YAML config file, parsing it only when it has changed on disk.
+
+    Every agent loading the same unchanged file shares one parsed config, so
+    the result is a read-only view and nothing nested in it may be mutated.
+    """
+    return MappingProxyType(_shared_parse(path, _parse_yaml_with_sidecar) or {})
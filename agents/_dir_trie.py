@@ -0,0 +1,94 @@
+"""Directory-prefix lookup shared by agents that route files to tree_focus domains."""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+def path_segments(path: str) -> List[str]:
+    """Split a POSIX-style path into segments, ignoring empty and '.' parts."""
+    return [segment for segment in path.split("/") if segment and segment != "."]
+
+
+class DirTrie:
+    """tree_focus directories indexed by path segment.
+
+    A file belongs to a directory when the directory's segments are a proper
+    prefix of the file's segments, so "src/f" matches "src/f/x.ts" but not
+    "src/foo/x.ts". Each lookup costs one dict probe per path segment no
+    matter how many directories are configured.
+    """
+
+    __slots__ = ("_root", "_order")
+
+    def __init__(self, tree_focus: Dict[str, Any]):
+        # Each node is (children by segment, domains whose directory ends here)
+        self._root: Tuple[Dict[str, Any], Set[str]] = ({}, set())
+        self._order = {domain: i for i, domain in enumerate(tree_focus)}
+        for domain, rules in tree_focus.items():
+            for directory in rules.get("directories", ()):
+                self._insert(directory, domain)
+
+    def _insert(self, directory: str, domain: str) -> None:
+        node = self._root
+        for segment in path_segments(directory):
+            node = node[0].setdefault(segment, ({}, set()))
+        node[1].add(domain)
+
+    def domains_for(self, file_path: str) -> Set[str]:
+        """Return every domain with a directory that contains file_path."""
+        found: Set[str] = set()
+        node = self._root
+        for segment in path_segments(file_path):
+            children, domains = node
+            found.update(domains)
+            node = children.get(segment)
+            if node is None:
+                break
+        return found
+
+    def first_domain(self, file_path: str) -> Optional[str]:
+        """Return the matching domain that comes first in tree_focus order."""
+        found = self.domains_for(file_path)
+        return min(found, key=self._order.__getitem__) if found else None
+
+    def contains_prefix(self, file_path: str, domain: str) -> bool:
+        """Check whether one of domain's directories prefixes file_path."""
+        return domain in self.domains_for(file_path)
+
+    def domains_under(self, dir_path: str) -> Set[str]:
+        """Return every domain that can have files below dir_path.
+
+        That is each domain with a directory containing dir_path, equal to it,
+        or nested anywhere beneath it.
+        """
+        found: Set[str] = set()
+        node = self._root
+        for segment in path_segments(dir_path):
+            children, domains = node
+            found.update(domains)
+            node = children.get(segment)
+            if node is None:
+                return found
+        stack = [node]
+        while stack:
+            children, domains = stack.pop()
+            found.update(domains)
+            stack.extend(children.values())
+        return found
+
+
+@lru_cache(maxsize=32)
+def _trie_for(directories: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> DirTrie:
+    return DirTrie({domain: {"directories": dirs} for domain, dirs in directories})
+
+
+def shared_dir_trie(tree_focus: Dict[str, Any]) -> DirTrie:
+    """Return the DirTrie for tree_focus, shared by every agent with the same directories.
+
+    A trie is never modified after it is built, so agents configured from the
+    same tree_focus can all route files through one instance.
+    """
+    return _trie_for(tuple(
+        (domain, tuple(rules.get("directories", ())))
+        for domain, rules in tree_focus.items()
+    ))
@@ -0,0 +1,28 @@
+"""Naming convention predicates shared by agents that check component and file names."""
+
+from typing import Callable, Dict
+
+
+def is_pascal_case(name: str) -> bool:
+    return name[:1].isupper() and "_" not in name
+
+
+def is_camel_case(name: str) -> bool:
+    return name[:1].islower() and "_" not in name
+
+
+def is_kebab_case(name: str) -> bool:
+    return name.islower() and "_" not in name and "-" in name
+
+
+def is_snake_case(name: str) -> bool:
+    return name.islower() and "_" in name
+
+
+# Naming conventions resolved by dict lookup; unknown conventions accept any name
+NAMING_VALIDATORS: Dict[str, Callable[[str], bool]] = {
+    "PascalCase": is_pascal_case,
+    "camelCase": is_camel_case,
+    "kebab-case": is_kebab_case,
+    "snake_case": is_snake_case,
+}
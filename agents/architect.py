@@ -1,25 +1,211 @@
-from typing import Dict, Any, List
+from typing import AbstractSet, Dict, Any, List, FrozenSet, Iterator, Mapping, Optional, Set, Tuple
 import os
+import re
+import copy
 import json
-import yaml
-from pathlib import Path
+import asyncio
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain
 from .base_agent import BaseAgent
+from ._config_cache import cached_parse
+from ._dir_trie import shared_dir_trie
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+# Package name without version specifiers, extras or markers; keeps npm "@scope/" prefixes
+_DEP_NAME_RE = re.compile(r"@?[^@=<>!~;\[\s]+")
+
+# Pinned requirement lines ("pkg==1.0", "pkg[extra]>=2", "pkg @ https://..."), capturing the name
+_REQUIREMENT_RE = re.compile(rb"(?m)^[ \t]*([A-Za-z0-9_.\-]+)(?:\[[^\]\n]*\])?[ \t]*[=<>~!@]")
+
+# Checked in priority order when a project lists more than one
+_PYTHON_FRAMEWORKS = ("fastapi", "flask", "django")
+
+# Manifests found during a structure walk are parsed here while the walk continues
+_MANIFEST_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="manifest-parser")
+
+
+def _file_suffix(name: str) -> str:
+    """Same result as os.path.splitext(name)[1] for a bare file name, without the path handling."""
+    stem = name.lstrip(".")
+    dot = stem.rfind(".")
+    return stem[dot:] if dot != -1 else ""
+
+
+def _parse_package_json(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        package_json = json.loads(f.read())
+
+    deps = package_json.get("dependencies", {})
+    dev_deps = package_json.get("devDependencies", {})
+
+    def has(name: str) -> bool:
+        return name in deps or name in dev_deps
+
+    framework = None
+    if has("react"):
+        framework = "next" if has("next") else "react"
+    elif has("vue"):
+        framework = "vue"
+
+    return {
+        "framework": framework,
+        # Names only, in first-seen order; the version values are never needed
+        "dependencies": list(dict.fromkeys(chain(deps, dev_deps)))
+    }
+
+
+def _parse_python_deps(path: str) -> Dict[str, Any]:
+    if path.endswith("requirements.txt"):
+        with open(path, "rb") as f:
+            deps = [m.group(1).decode() for m in _REQUIREMENT_RE.finditer(f.read())]
+    else:  # pyproject.toml
+        if tomllib is not None:
+            with open(path, "rb") as f:
+                pyproject = tomllib.load(f)
+        else:
+            import toml
+            with open(path, "r") as f:
+                pyproject = toml.load(f)
+        deps = list(pyproject.get("tool", {}).get("poetry", {}).get("dependencies", {}).keys())
+
+    dep_names = {dep.lower() for dep in deps}
+    framework = next((name for name in _PYTHON_FRAMEWORKS if name in dep_names), None)
+
+    return {
+        "framework": framework,
+        "dependencies": deps
+    }
+
+
+@functools.lru_cache(maxsize=128)
+def _frontend_architecture(frontend_type: str, features: FrozenSet[str]) -> Optional[Dict[str, Any]]:
+    """Design frontend architecture based on framework and features."""
+    if not frontend_type:
+        return None
+
+    architecture = {
+        "framework": frontend_type,
+        "components": [
+            {
+                "name": "App",
+                "type": "root",
+                "children": []
+            }
+        ],
+        "routing": "file-based" if frontend_type == "next" else "react-router",
+        "state_management": "react-query" if "api" in features else "react-context"
+    }
+
+    # Add common components based on features
+    if "authentication" in features:
+        architecture["components"].extend([
+            {"name": "AuthProvider", "type": "context"},
+            {"name": "LoginForm", "type": "form"},
+            {"name": "ProtectedRoute", "type": "hoc"}
+        ])
+
+    if "dashboard" in features:
+        architecture["components"].extend([
+            {"name": "Dashboard", "type": "page"},
+            {"name": "Sidebar", "type": "navigation"},
+            {"name": "Header", "type": "navigation"}
+        ])
+
+    return architecture
+
+
+@functools.lru_cache(maxsize=128)
+def _backend_architecture(backend_type: str, features: FrozenSet[str]) -> Optional[Dict[str, Any]]:
+    """Design backend architecture based on framework and features."""
+    if not backend_type:
+        return None
+
+    architecture = {
+        "framework": backend_type,
+        "database": "sqlalchemy" if backend_type in ["fastapi", "flask"] else "django-orm",
+        "authentication": "jwt",
+        "endpoints": []
+    }
+
+    # Add common endpoints based on features
+    if "authentication" in features:
+        architecture["endpoints"].extend([
+            {
+                "path": "/api/auth/login",
+                "methods": ["POST"],
+                "auth_required": False
+            },
+            {
+                "path": "/api/auth/register",
+                "methods": ["POST"],
+                "auth_required": False
+            }
+        ])
+
+    if "dashboard" in features:
+        architecture["endpoints"].extend([
+            {
+                "path": "/api/dashboard",
+                "methods": ["GET"],
+                "auth_required": True
+            }
+        ])
+
+    return architecture
+
 
 class ArchitectAgent(BaseAgent):
-    def __init__(self, config: Dict[str, Any]):
+    REQUIRED_DEPLOYMENT_FIELDS = ("app_name", "port", "environment", "stack")
+    # Manifest files that supply a domain's framework and dependencies
+    DOMAIN_MANIFESTS = {
+        "frontend": ("package.json",),
+        "backend": ("requirements.txt", "pyproject.toml")
+    }
+
+    needs_full_config = True
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
         super().__init__(config)
-        self.config = self._load_config()
         self.tree_focus = self.config.get("tree_focus", {})
         self.validation_rules = self.config.get("agents", {}).get("architect", {}).get("validation_rules", {})
 
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from YAML file."""
-        config_path = Path("config/config.yaml")
-        if not config_path.exists():
-            return {}
-        
-        with open(config_path, "r") as f:
-            return yaml.safe_load(f)
+        # Resolve validation rules once so _validate_deployment only reads attributes
+        port_range = self.validation_rules.get("port_range", {})
+        self._port_min = port_range.get("min", 1024)
+        self._port_max = port_range.get("max", 65535)
+        self._environments = tuple(
+            self.validation_rules.get("environments", ("development", "staging", "production"))
+        )
+        self._valid_environments = frozenset(self._environments)
+
+        # Directories match on whole path segments, as for the developer and reviewer
+        self._dir_trie = shared_dir_trie(self.tree_focus)
+        # Tuples let str.endswith test every extension in a single call
+        self._domain_exts = {
+            domain: tuple(domain_config.get("extensions", ()))
+            for domain, domain_config in self.tree_focus.items()
+        }
+
+        # Final path suffix -> domains declaring an extension that ends with it
+        self._ext_domains: Dict[str, List[str]] = {}
+        # Domains with dotless extensions (say "Dockerfile"), which no path suffix
+        # can key; those files are matched with endswith, as is_within_domain does
+        self._bare_ext_domains: List[str] = []
+        for domain, exts in self._domain_exts.items():
+            for ext in exts:
+                key = os.path.splitext(ext)[1]
+                if not key:
+                    if domain not in self._bare_ext_domains:
+                        self._bare_ext_domains.append(domain)
+                    continue
+                domains = self._ext_domains.setdefault(key, [])
+                if domain not in domains:
+                    domains.append(domain)
 
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         action = input_data.get("action")
@@ -39,22 +225,69 @@ class ArchitectAgent(BaseAgent):
         if domain not in self.tree_focus:
             return False
 
-        domain_config = self.tree_focus[domain]
-        
-        # Check directories
-        if not any(file_path.startswith(dir) for dir in domain_config["directories"]):
-            return False
-        
-        # Check extensions
-        if not any(file_path.endswith(ext) for ext in domain_config["extensions"]):
-            return False
-        
-        return True
+        return (
+            self._dir_trie.contains_prefix(file_path, domain)
+            and file_path.endswith(self._domain_exts[domain])
+        )
+
+    def _domains_for_path(self, file_path: str, suffix: Optional[str] = None) -> List[str]:
+        """Get every domain whose directories and extensions match the file.
+
+        ``suffix`` may be passed when the caller already knows the file's extension.
+        """
+        if suffix is None:
+            suffix = os.path.splitext(file_path)[1]
+        candidates = self._ext_domains.get(suffix, ())
+        if self._bare_ext_domains:
+            candidates = list(candidates)
+            candidates.extend(domain for domain in self._bare_ext_domains if domain not in candidates)
+        if not candidates:
+            return []
+        in_dirs = self._dir_trie.domains_for(file_path)
+        return [
+            domain for domain in candidates
+            if domain in in_dirs and file_path.endswith(self._domain_exts[domain])
+        ]
+
+    def _dir_domains(self, relative_dir: str) -> Set[str]:
+        """Get the domains whose files can live under a directory."""
+        return self._dir_trie.domains_under(relative_dir)
+
+    def _iter_project_files(self, root: str, resolved: AbstractSet[str] = frozenset()) -> Iterator[Tuple[str, str, str]]:
+        """Yield (relative_path, file_path, name) for project files, skipping subtrees outside every domain.
+
+        Directories that can only hold files for domains in ``resolved`` are skipped as well;
+        the set is re-checked as the walk proceeds, so callers may grow it while iterating.
+        """
+        stack = [(root, "", None)]
+        while stack:
+            dir_path, relative_dir, domains = stack.pop()
+            if domains is not None and domains <= resolved:
+                continue
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir():
+                    # Match os.walk: symlinked directories are not followed
+                    if not entry.is_symlink():
+                        child_dir = relative_dir + entry.name + os.sep
+                        child_domains = self._dir_domains(child_dir)
+                        if child_domains:
+                            subdirs.append((entry.path, child_dir, child_domains))
+                else:
+                    yield relative_dir + entry.name, entry.path, entry.name
+
+            # Reversed so directories are visited in listing order, like os.walk
+            stack.extend(reversed(subdirs))
 
     async def _validate_deployment(self, requirements: Dict[str, Any]) -> Dict[str, Any]:
         # Validate required fields
-        required_fields = ["app_name", "port", "environment", "stack"]
-        for field in required_fields:
+        for field in self.REQUIRED_DEPLOYMENT_FIELDS:
             if field not in requirements:
                 return {
                     "status": "invalid",
@@ -63,23 +296,21 @@ class ArchitectAgent(BaseAgent):
 
         # Validate port number using config rules
         port = requirements["port"]
-        port_range = self.validation_rules.get("port_range", {"min": 1024, "max": 65535})
-        if not isinstance(port, int) or port < port_range["min"] or port > port_range["max"]:
+        if not isinstance(port, int) or port < self._port_min or port > self._port_max:
             return {
                 "status": "invalid",
-                "reason": f"Invalid port number. Must be between {port_range['min']} and {port_range['max']}"
+                "reason": f"Invalid port number. Must be between {self._port_min} and {self._port_max}"
             }
 
         # Validate environment using config rules
-        valid_environments = self.validation_rules.get("environments", ["development", "staging", "production"])
-        if requirements["environment"] not in valid_environments:
+        if requirements["environment"] not in self._valid_environments:
             return {
                 "status": "invalid",
-                "reason": f"Invalid environment. Must be one of: {', '.join(valid_environments)}"
+                "reason": f"Invalid environment. Must be one of: {', '.join(self._environments)}"
             }
 
         # Analyze existing project structure
-        project_analysis = await self._analyze_structure(".")
+        project_analysis = await self._analyze_structure(".", stop_when_resolved=True)
         if project_analysis["status"] == "invalid":
             return project_analysis
 
@@ -127,35 +358,69 @@ class ArchitectAgent(BaseAgent):
             "tasks": tasks
         }
 
+    @staticmethod
+    def _normalize_dep(name: str) -> str:
+        """Reduce a dependency spec such as "react@^18" or "Flask>=2.0" to its package name."""
+        match = _DEP_NAME_RE.match(name.strip())
+        return match.group(0).lower() if match else ""
+
     def _check_missing_dependencies(self, existing_deps: List[str], required_deps: List[str]) -> List[str]:
         """Check for missing dependencies."""
-        return [dep for dep in required_deps if not any(existing.startswith(dep) for existing in existing_deps)]
-
-    async def _analyze_structure(self, path: str) -> Dict[str, Any]:
-        """Analyze project structure and validate against domain boundaries."""
+        existing = {self._normalize_dep(dep) for dep in existing_deps}
+        return [dep for dep in required_deps if self._normalize_dep(dep) not in existing]
+
+    async def _analyze_structure(self, path: str, stop_when_resolved: bool = False) -> Dict[str, Any]:
+        """Analyze project structure and validate against domain boundaries.
+
+        With ``stop_when_resolved`` the walk ends once every domain exists and has had its
+        manifest parsed, so the per-domain file lists are partial.
+        """
+        # The walk is blocking file system work, so keep it off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self._analyze_structure_sync, path, stop_when_resolved)
+        )
+
+    def _analyze_structure_sync(self, path: str, stop_when_resolved: bool = False) -> Dict[str, Any]:
+        """Walk the project tree; see _analyze_structure."""
         structure = {
             "frontend": {"exists": False, "framework": None, "dependencies": [], "files": []},
             "backend": {"exists": False, "framework": None, "dependencies": [], "files": []},
             "database": {"exists": False, "framework": None, "dependencies": [], "files": []}
         }
+        pending = set(self.tree_focus) if stop_when_resolved else set()
+        resolved: Set[str] = set()
+        manifests_seen: Set[str] = set()
+        manifest_jobs: List[Tuple[str, "Future[Dict[str, Any]]"]] = []
 
         # Walk through project files
-        for root, _, files in os.walk(path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, path)
-
-                # Check each domain
-                for domain, domain_config in self.tree_focus.items():
-                    if self.is_within_domain(relative_path, domain):
-                        structure[domain]["exists"] = True
-                        structure[domain]["files"].append(relative_path)
-
-                        # Extract dependencies
-                        if file == "package.json":
-                            structure["frontend"].update(self._analyze_package_json(file_path))
-                        elif file in ["requirements.txt", "pyproject.toml"]:
-                            structure["backend"].update(self._analyze_python_deps(file_path))
+        for relative_path, file_path, file in self._iter_project_files(path, resolved):
+            # Check only the domains the file can belong to
+            for domain in self._domains_for_path(relative_path, _file_suffix(file)):
+                structure[domain]["exists"] = True
+                structure[domain]["files"].append(relative_path)
+
+                # Extract dependencies
+                if file == "package.json":
+                    manifest_jobs.append(("frontend", _MANIFEST_EXECUTOR.submit(self._analyze_package_json, file_path)))
+                    manifests_seen.add("frontend")
+                elif file in ["requirements.txt", "pyproject.toml"]:
+                    manifest_jobs.append(("backend", _MANIFEST_EXECUTOR.submit(self._analyze_python_deps, file_path)))
+                    manifests_seen.add("backend")
+
+            if pending:
+                for domain in list(pending):
+                    if structure.get(domain, {}).get("exists") and (
+                        domain not in self.DOMAIN_MANIFESTS or domain in manifests_seen
+                    ):
+                        pending.discard(domain)
+                        resolved.add(domain)
+                if not pending:
+                    break
+
+        # Apply in discovery order so the last manifest found wins, as in a serial walk
+        for domain, job in manifest_jobs:
+            structure[domain].update(job.result())
 
         return {
             "status": "valid",
@@ -165,47 +430,14 @@ class ArchitectAgent(BaseAgent):
     def _analyze_package_json(self, file_path: str) -> Dict[str, Any]:
         """Analyze package.json for frontend dependencies."""
         try:
-            with open(file_path, "r") as f:
-                package_json = json.load(f)
-                deps = {**package_json.get("dependencies", {}), **package_json.get("devDependencies", {})}
-                
-                framework = None
-                if "react" in deps:
-                    framework = "next" if "next" in deps else "react"
-                elif "vue" in deps:
-                    framework = "vue"
-
-                return {
-                    "framework": framework,
-                    "dependencies": list(deps.keys())
-                }
+            return cached_parse(file_path, _parse_package_json)
         except (json.JSONDecodeError, FileNotFoundError):
             return {"framework": None, "dependencies": []}
 
     def _analyze_python_deps(self, file_path: str) -> Dict[str, Any]:
         """Analyze Python dependencies."""
         try:
-            if file_path.endswith("requirements.txt"):
-                with open(file_path, "r") as f:
-                    deps = [line.split("==")[0] for line in f.readlines() if "==" in line]
-            else:  # pyproject.toml
-                import toml
-                with open(file_path, "r") as f:
-                    pyproject = toml.load(f)
-                    deps = list(pyproject.get("tool", {}).get("poetry", {}).get("dependencies", {}).keys())
-
-            framework = None
-            if "fastapi" in deps:
-                framework = "fastapi"
-            elif "flask" in deps:
-                framework = "flask"
-            elif "django" in deps:
-                framework = "django"
-
-            return {
-                "framework": framework,
-                "dependencies": deps
-            }
+            return cached_parse(file_path, _parse_python_deps)
         except Exception:
             return {"framework": None, "dependencies": []}
 
@@ -236,73 +468,9 @@ class ArchitectAgent(BaseAgent):
 
     def _design_frontend_architecture(self, frontend_type: str, features: list) -> Dict[str, Any]:
         """Design frontend architecture based on framework and features."""
-        if not frontend_type:
-            return None
-
-        architecture = {
-            "framework": frontend_type,
-            "components": [
-                {
-                    "name": "App",
-                    "type": "root",
-                    "children": []
-                }
-            ],
-            "routing": "file-based" if frontend_type == "next" else "react-router",
-            "state_management": "react-query" if "api" in features else "react-context"
-        }
-
-        # Add common components based on features
-        if "authentication" in features:
-            architecture["components"].extend([
-                {"name": "AuthProvider", "type": "context"},
-                {"name": "LoginForm", "type": "form"},
-                {"name": "ProtectedRoute", "type": "hoc"}
-            ])
-
-        if "dashboard" in features:
-            architecture["components"].extend([
-                {"name": "Dashboard", "type": "page"},
-                {"name": "Sidebar", "type": "navigation"},
-                {"name": "Header", "type": "navigation"}
-            ])
-
-        return architecture
+        # The design only depends on feature membership; copy so callers can't alter the cache
+        return copy.deepcopy(_frontend_architecture(frontend_type, frozenset(features)))
 
     def _design_backend_architecture(self, backend_type: str, features: list) -> Dict[str, Any]:
         """Design backend architecture based on framework and features."""
-        if not backend_type:
-            return None
-
-        architecture = {
-            "framework": backend_type,
-            "database": "sqlalchemy" if backend_type in ["fastapi", "flask"] else "django-orm",
-            "authentication": "jwt",
-            "endpoints": []
-        }
-
-        # Add common endpoints based on features
-        if "authentication" in features:
-            architecture["endpoints"].extend([
-                {
-                    "path": "/api/auth/login",
-                    "methods": ["POST"],
-                    "auth_required": False
-                },
-                {
-                    "path": "/api/auth/register",
-                    "methods": ["POST"],
-                    "auth_required": False
-                }
-            ])
-
-        if "dashboard" in features:
-            architecture["endpoints"].extend([
-                {
-                    "path": "/api/dashboard",
-                    "methods": ["GET"],
-                    "auth_required": True
-                }
-            ])
-
-        return architecture
\ No newline at end of file
+        return copy.deepcopy(_backend_architecture(backend_type, frozenset(features)))
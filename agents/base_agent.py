@@ -1,48 +1,205 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Mapping, Optional, Set, Tuple
 import os
+import time
+import copy
 import json
+import functools
 import aiohttp
 import markdown
 import asyncio
+import logging
 import importlib
 import inspect
 from pathlib import Path
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime
+from ._config_cache import load_config
 
-print("Loading BaseAgent class...")
+logger = logging.getLogger(__name__)
+
+# Prefer the C-backed lxml parser when it is installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Top-level entries of the default branch, with blob contents inlined
+_GITHUB_ROOT_FILES_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    object(expression: "HEAD:") {
+      ... on Tree {
+        entries {
+          name
+          object { ... on Blob { text } }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Only <code> elements are needed when mining documentation for examples
+_CODE_STRAINER = SoupStrainer("code")
+
+@functools.lru_cache(maxsize=256)
+def _compile_source(source: str):
+    """Compile learned pattern source once; repeated tests and runs reuse the code object."""
+    return compile(source, "<learned_pattern>", "exec")
+
+@functools.lru_cache(maxsize=512)
+def _read_entry(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a knowledge entry file; the mtime argument invalidates stale results."""
+    with open(path, 'r') as f:
+        return json.load(f)
 
 class KnowledgeBase:
+    # Journal entries accumulated before the index snapshot is rewritten
+    compact_threshold = 100
+    _SLUG_TABLE = str.maketrans(" ", "_")
+
     def __init__(self, storage_dir: Path):
         self.storage_dir = storage_dir
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         self.index_file = storage_dir / "knowledge_index.json"
-        self.index = self._load_index()
+        self.journal_file = storage_dir / "knowledge_index.journal.jsonl"
+        self._journal = None
+        self._journal_entries = 0
+        self.index, rebuilt_summaries = self._load_index()
+        if rebuilt_summaries:
+            # Persist them so later loads read the summaries instead of every entry file
+            self._compact_index()
+
+    def _load_index(self) -> Tuple[Dict[str, Any], bool]:
+        """Load the knowledge index snapshot and replay any journaled additions.
 
-    def _load_index(self) -> Dict[str, Any]:
-        """Load the knowledge index."""
+        Also reports whether topic summaries missing from the snapshot were rebuilt.
+        """
         if self.index_file.exists():
             with open(self.index_file, 'r') as f:
-                return json.load(f)
-        return {
-            "topics": {},
-            "tags": {},
-            "references": {},
-            "last_updated": None
-        }
+                index = json.load(f)
+        else:
+            index = {
+                "topics": {},
+                "tags": {},
+                "references": {},
+                "summaries": {},
+                "last_updated": None
+            }
+
+        # Indexes written before summaries were tracked get them rebuilt once
+        summaries = index.setdefault("summaries", {})
+        rebuilt_summaries = False
+        for topic, topic_ids in index["topics"].items():
+            if topic not in summaries:
+                summaries[topic] = self._build_summary(topic_ids)
+                rebuilt_summaries = True
+
+        if self.journal_file.exists():
+            # IDs already indexed per topic; entries in the snapshot are skipped, so replaying is idempotent
+            indexed: Dict[str, Set[str]] = {}
+            with open(self.journal_file, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted write
+                        continue
+                    topic_ids = indexed.get(record["topic"])
+                    if topic_ids is None:
+                        topic_ids = indexed[record["topic"]] = set(index["topics"].get(record["topic"], ()))
+                    if record["id"] not in topic_ids:
+                        topic_ids.add(record["id"])
+                        self._index_entry(
+                            index, record["topic"], record["id"], record["tags"], record["refs"],
+                            record.get("key_points", []), record["timestamp"]
+                        )
+                    index["last_updated"] = record["timestamp"]
+                    self._journal_entries += 1
+
+        return index, rebuilt_summaries
+
+    def _index_entry(self, index: Dict[str, Any], topic: str, knowledge_id: str, tags: List[str],
+                     ref_ids: List[str], key_points: List[str], created_at: str) -> None:
+        """Record a knowledge entry under its topic, tags and references, and fold it into the topic summary."""
+        index["topics"].setdefault(topic, []).append(knowledge_id)
 
-    def _save_index(self):
-        """Save the knowledge index."""
-        self.index["last_updated"] = datetime.now().isoformat()
-        with open(self.index_file, 'w') as f:
-            json.dump(self.index, f, indent=2)
+        for tag in tags:
+            index["tags"].setdefault(tag, []).append(knowledge_id)
+
+        for ref_id in ref_ids:
+            index["references"].setdefault(ref_id, []).append(knowledge_id)
+
+        summary = index["summaries"].setdefault(topic, self._empty_summary())
+        self._merge_summary(summary, key_points, ref_ids, created_at)
+
+    @staticmethod
+    def _empty_summary() -> Dict[str, Any]:
+        return {"total_entries": 0, "key_points": [], "references": [], "latest_update": None}
+
+    @staticmethod
+    def _merge_summary(summary: Dict[str, Any], key_points: List[str], ref_ids: List[str], created_at: str) -> None:
+        """Add one entry's key points and references to a topic summary, keeping them unique."""
+        summary["total_entries"] += 1
+        for field, values in (("key_points", key_points), ("references", ref_ids)):
+            seen = set(summary[field])
+            for value in values:
+                if value not in seen:
+                    seen.add(value)
+                    summary[field].append(value)
+        if summary["latest_update"] is None or created_at > summary["latest_update"]:
+            summary["latest_update"] = created_at
+
+    def _build_summary(self, knowledge_ids: List[str]) -> Dict[str, Any]:
+        """Build a topic summary from its stored entries."""
+        summary = self._empty_summary()
+        for _, entry in self._load_entries(knowledge_ids):
+            ref_ids = [ref.get("url", ref.get("id")) for ref in entry.get("references", [])]
+            self._merge_summary(
+                summary, entry.get("key_points", []), [ref_id for ref_id in ref_ids if ref_id],
+                entry["created_at"]
+            )
+        return summary
+
+    def _compact_index(self):
+        """Write the full index snapshot and truncate the journal."""
+        tmp_file = self.index_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(self.index, f, separators=(",", ":"))
+        os.replace(tmp_file, self.index_file)
+
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+        self._journal_entries = 0
+
+    def _append_journal(self, record: Dict[str, Any]):
+        """Append a single index update instead of rewriting the whole index."""
+        if self._journal is None:
+            self._journal = open(self.journal_file, 'a', buffering=1)
+        self._journal.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._journal_entries += 1
+
+        if self._journal_entries >= self.compact_threshold:
+            self._compact_index()
+
+    def close(self):
+        """Fold the journal into the index snapshot."""
+        if self._journal_entries:
+            self._compact_index()
 
     def add_knowledge(self, topic: str, content: Dict[str, Any], tags: List[str] = None) -> str:
         """Add new knowledge to the knowledge base."""
         # Create a unique ID for the knowledge entry
-        timestamp = datetime.now().isoformat()
-        knowledge_id = f"{topic.lower().replace(' ', '_')}_{timestamp}"
+        timestamp_ns = time.time_ns()
+        timestamp = datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+        knowledge_id = f"{topic.lower().translate(self._SLUG_TABLE)}_{timestamp_ns}"
         
         # Store the actual content
         knowledge_file = self.storage_dir / f"{knowledge_id}.json"
@@ -62,28 +219,38 @@ class KnowledgeBase:
             json.dump(knowledge_data, f, indent=2)
         
         # Update the index
-        if topic not in self.index["topics"]:
-            self.index["topics"][topic] = []
-        self.index["topics"][topic].append(knowledge_id)
-        
-        # Update tags
-        if tags:
-            for tag in tags:
-                if tag not in self.index["tags"]:
-                    self.index["tags"][tag] = []
-                self.index["tags"][tag].append(knowledge_id)
-        
-        # Update references
-        for ref in content.get("references", []):
-            ref_id = ref.get("url", ref.get("id"))
-            if ref_id:
-                if ref_id not in self.index["references"]:
-                    self.index["references"][ref_id] = []
-                self.index["references"][ref_id].append(knowledge_id)
-        
-        self._save_index()
+        ref_ids = [
+            ref_id
+            for ref in content.get("references", [])
+            if (ref_id := ref.get("url", ref.get("id")))
+        ]
+        key_points = content.get("key_points", [])
+        self._index_entry(self.index, topic, knowledge_id, tags or [], ref_ids, key_points, timestamp)
+        self.index["last_updated"] = timestamp
+
+        self._append_journal({
+            "op": "add",
+            "topic": topic,
+            "id": knowledge_id,
+            "tags": tags or [],
+            "refs": ref_ids,
+            "key_points": key_points,
+            "timestamp": timestamp
+        })
         return knowledge_id
 
+    def _load_entries(self, knowledge_ids) -> List[Tuple[int, Dict[str, Any]]]:
+        """Load (mtime_ns, entry) pairs, reusing parsed entries whose files are unchanged."""
+        entries = []
+        for kid in knowledge_ids:
+            knowledge_file = self.storage_dir / f"{kid}.json"
+            try:
+                mtime_ns = knowledge_file.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            entries.append((mtime_ns, _read_entry(str(knowledge_file), mtime_ns)))
+        return entries
+
     def get_knowledge(self, topic: str = None, tag: str = None, reference: str = None) -> List[Dict[str, Any]]:
         """Retrieve knowledge by topic, tag, or reference."""
         knowledge_ids = set()
@@ -97,68 +264,116 @@ class KnowledgeBase:
         if reference and reference in self.index["references"]:
             knowledge_ids.update(self.index["references"][reference])
         
-        knowledge = []
-        for kid in knowledge_ids:
-            knowledge_file = self.storage_dir / f"{kid}.json"
-            if knowledge_file.exists():
-                with open(knowledge_file, 'r') as f:
-                    knowledge.append(json.load(f))
-        
-        return knowledge
+        # Parsed entries are shared through the read cache, so hand out copies
+        return [copy.deepcopy(entry) for _, entry in self._load_entries(knowledge_ids)]
 
     def summarize_knowledge(self, topic: str) -> Optional[Dict[str, Any]]:
         """Get a summary of all knowledge for a topic."""
-        knowledge = self.get_knowledge(topic=topic)
-        if not knowledge:
+        summary = self.index["summaries"].get(topic)
+        if not summary or not summary["total_entries"]:
             return None
-        
-        return {
-            "topic": topic,
-            "total_entries": len(knowledge),
-            "key_points": list(set(
-                point
-                for entry in knowledge
-                for point in entry.get("key_points", [])
-            )),
-            "references": list(set(
-                ref.get("url", ref.get("id"))
-                for entry in knowledge
-                for ref in entry.get("references", [])
-            )),
-            "latest_update": max(entry["created_at"] for entry in knowledge)
-        }
+
+        return {"topic": topic, **copy.deepcopy(summary)}
 
 class BaseAgent(ABC):
-    def __init__(self, config: Dict[str, Any]):
-        print(f"Initializing BaseAgent with config: {config}")
-        self.config = config
+    # Upper bound on learning sources fetched and tested at the same time
+    max_concurrent_sources = 8
+    # Upper bound on concurrent GitHub repository fetches, to stay under rate limits
+    max_concurrent_github = 10
+    # Whether the agent reads the whole project config (tree_focus, workflows,
+    # other agents' rules) rather than just its own section of it
+    needs_full_config = False
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
+        """Use config as given; None means reading config/config.yaml."""
+        logger.debug("Initializing BaseAgent with config: %r", config)
+        self.config = config if config is not None else self._load_config()
         self.name = self.__class__.__name__
         self.knowledge_base = KnowledgeBase(
             Path(f"knowledge/{self.name.lower()}")
         )
         self.learned_patterns = {}
-        print(f"BaseAgent initialized with name: {self.name}")
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # False while the session is borrowed from an owner such as the Orchestrator
+        self._owns_session = True
+        self._github_semaphore: Optional[asyncio.Semaphore] = None
+        logger.debug("BaseAgent initialized with name: %s", self.name)
+
+    def _load_config(self) -> Mapping[str, Any]:
+        """Load configuration from YAML file."""
+        config_path = Path("config/config.yaml")
+        if not config_path.exists():
+            return {}
+
+        return load_config(str(config_path))
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the agent's shared HTTP session, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        # A session is bound to the loop it was created on
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            stale = self._session if self._owns_session else None
+            session = self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, limit_per_host=10, keepalive_timeout=60)
+            )
+            self._session_loop = loop
+            self._owns_session = True
+            # Semaphores are also tied to a loop, so it is created alongside the session
+            self._github_semaphore = asyncio.Semaphore(self.max_concurrent_github)
+            # Close one left over from an earlier loop so its connector isn't leaked. The
+            # new session is installed first, so callers arriving meanwhile share it
+            if stale is not None and not stale.closed:
+                await stale.close()
+            return session
+        return self._session
+
+    async def attach_session(self, session: aiohttp.ClientSession) -> None:
+        """Borrow a session owned elsewhere so several agents share one connection pool.
+
+        Must be called on the loop the session belongs to; the owner closes it.
+        A session the agent opened itself is closed once the borrowed one is in place.
+        """
+        stale = self._session if self._owns_session else None
+        self._session = session
+        self._session_loop = asyncio.get_running_loop()
+        self._owns_session = False
+        self._github_semaphore = asyncio.Semaphore(self.max_concurrent_github)
+        if stale is not None and stale is not session and not stale.closed:
+            await stale.close()
+
+    async def warmup(self) -> None:
+        """Do one-off setup ahead of the first task; subclasses add their own."""
+        await self._get_session()
+
+    async def aclose(self) -> None:
+        """Close the agent's shared HTTP session and compact its knowledge index."""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+        self.knowledge_base.close()
 
     async def _search_github(self, query: str) -> List[Dict[str, Any]]:
-        print(f"BaseAgent._search_github called with query: {query}")
-        async with aiohttp.ClientSession() as session:
-            api_url = "https://api.github.com/search/repositories"
-            params = {
-                "q": query,
-                "sort": "stars",
-                "order": "desc",
-                "per_page": 5
-            }
-            
-            try:
-                async with session.get(api_url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get("items", [])
-            except Exception as e:
-                self.log(f"Error searching GitHub: {str(e)}")
-            
-            return []
+        logger.debug("BaseAgent._search_github called with query: %s", query)
+        api_url = "https://api.github.com/search/repositories"
+        params = {
+            "q": query,
+            "sort": "stars",
+            "order": "desc",
+            "per_page": 5
+        }
+
+        try:
+            session = await self._get_session()
+            async with session.get(api_url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return data.get("items", [])
+        except Exception as e:
+            logger.warning("[%s] Error searching GitHub: %s", self.name, e)
+
+        return []
 
     async def _search_documentation(self, topic: str) -> List[Dict[str, Any]]:
         """Search relevant documentation."""
@@ -212,26 +427,38 @@ class BaseAgent(ABC):
         # First, try to find relevant documentation or examples
         sources = await self._find_learning_sources(topic)
         
-        # Generate and test implementation for each source
-        implementations = []
-        for source in sources:
-            if impl := await self._generate_implementation(source):
-                if await self._test_implementation(impl):
-                    implementations.append(impl)
-                    # Save successful pattern
-                    self.learned_patterns[topic] = impl
-        
+        # Generate and test implementations for all sources concurrently
+        semaphore = asyncio.Semaphore(self.max_concurrent_sources)
+        results = await asyncio.gather(*(
+            self._process_source(source, semaphore) for source in sources
+        ))
+        implementations = [impl for impl in results if impl]
+        if implementations:
+            # Save the last successful pattern, in source order
+            self.learned_patterns[topic] = implementations[-1]
+
         return {
             "sources": sources,
             "implementations": implementations
         }
 
+    async def _process_source(self, source: Dict[str, Any], semaphore: asyncio.Semaphore) -> Optional[str]:
+        """Generate and test an implementation for a single source."""
+        async with semaphore:
+            if impl := await self._generate_implementation(source):
+                if await self._test_implementation(impl):
+                    return impl
+        return None
+
     async def _find_learning_sources(self, topic: str) -> List[Dict[str, Any]]:
         """Find relevant learning sources for a topic."""
         sources = []
-        
-        # Try GitHub first
-        github_results = await self._search_github(f"how to {topic} python")
+
+        # Query GitHub and documentation concurrently
+        github_results, doc_results = await asyncio.gather(
+            self._search_github(f"how to {topic} python"),
+            self._search_documentation(topic)
+        )
         if github_results:
             sources.extend([{
                 "type": "github",
@@ -239,8 +466,6 @@ class BaseAgent(ABC):
                 "description": repo.get("description", "No description available")
             } for repo in github_results])
 
-        # Try documentation
-        doc_results = await self._search_documentation(topic)
         if doc_results:
             sources.extend([{
                 "type": "documentation",
@@ -267,7 +492,7 @@ class BaseAgent(ABC):
         try:
             # Create a safe execution environment
             namespace = {}
-            exec(implementation, namespace)
+            exec(_compile_source(implementation), namespace)
             # Basic validation - check if it defines expected functions
             return all(
                 func in namespace
@@ -282,7 +507,7 @@ class BaseAgent(ABC):
         try:
             # Create execution environment
             namespace = {}
-            exec(pattern, namespace)
+            exec(_compile_source(pattern), namespace)
             # Execute the pattern's main function
             if "execute" in namespace:
                 return namespace["execute"]()
@@ -300,7 +525,13 @@ class BaseAgent(ABC):
         user, repo = parts[-2], parts[-1]
         
         # Fetch repository content
-        async with aiohttp.ClientSession() as session:
+        session = await self._get_session()
+        async with self._github_semaphore:
+            token = os.environ.get("GITHUB_API_KEY")
+            if token:
+                # GraphQL returns the root listing and file contents in one round trip
+                return await self._fetch_github_python_file(session, user, repo, token)
+
             api_url = f"https://api.github.com/repos/{user}/{repo}/contents"
             async with session.get(api_url) as response:
                 if response.status == 200:
@@ -318,23 +549,36 @@ class BaseAgent(ABC):
                                 return await file_response.text()
         return None
 
+    async def _fetch_github_python_file(self, session: aiohttp.ClientSession, user: str,
+                                        repo: str, token: str) -> Optional[str]:
+        """Fetch the first top-level Python file of a repository through the GraphQL API."""
+        async with session.post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": _GITHUB_ROOT_FILES_QUERY, "variables": {"owner": user, "name": repo}},
+            headers={"Authorization": f"bearer {token}"}
+        ) as response:
+            if response.status != 200:
+                return None
+            data = await response.json()
+
+        tree = ((data.get("data") or {}).get("repository") or {}).get("object") or {}
+        for entry in tree.get("entries", []):
+            if entry["name"].endswith(".py") and (entry.get("object") or {}).get("text") is not None:
+                return entry["object"]["text"]
+        return None
+
     async def _generate_from_documentation(self, doc_url: str) -> Optional[str]:
         """Generate implementation from documentation."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(doc_url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        # Look for code examples
-                        code_blocks = soup.find_all('code')
-                        python_code = [
-                            block.text 
-                            for block in code_blocks 
-                            if 'python' in block.get('class', [''])[0].lower()
-                        ]
-                        if python_code:
-                            return python_code[0]
+            session = await self._get_session()
+            async with session.get(doc_url) as response:
+                if response.status == 200:
+                    html = await response.text()
+                    soup = BeautifulSoup(html, HTML_PARSER, parse_only=_CODE_STRAINER)
+                    # Return the first Python code example
+                    for block in soup.find_all('code'):
+                        if 'python' in block.get('class', [''])[0].lower():
+                            return block.text
             return None
         except Exception as e:
             self.log(f"Error parsing documentation: {str(e)}")
@@ -342,7 +586,7 @@ class BaseAgent(ABC):
 
     def log(self, message: str) -> None:
         """Log agent activity."""
-        print(f"[{self.name}] {message}")
+        logger.info("[%s] %s", self.name, message)
 
     @abstractmethod
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,41 +1,286 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Awaitable, Callable, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple, Union
 import os
-import yaml
+import re
 import json
-from pathlib import Path
+import asyncio
+import functools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from .base_agent import BaseAgent
+from ._dir_trie import shared_dir_trie
+from ._validators import NAMING_VALIDATORS
+
+# Component files are written here so a batch of writes overlaps instead of
+# blocking the event loop one file at a time
+_FILE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="developer-io")
+
+
+def _make_dirs(directories: Iterable[str]) -> None:
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+
+
+def _open_for_write(path: str, make_dirs: bool, existing_only: bool) -> Optional[int]:
+    """Open path for writing, returning None if existing_only and it is missing."""
+    if existing_only:
+        # No O_CREAT, so the open itself is the existence check
+        try:
+            return os.open(path, os.O_WRONLY | os.O_TRUNC)
+        except FileNotFoundError:
+            return None
+
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    try:
+        return os.open(path, flags, 0o666)
+    except FileNotFoundError:
+        # The directory was remembered as created but has since been removed
+        directory = os.path.dirname(path)
+        if not make_dirs or not directory:
+            raise
+        os.makedirs(directory, exist_ok=True)
+        return os.open(path, flags, 0o666)
+
+
+def _write_text(path: str, content: Union[str, bytes], make_dirs: bool = False, existing_only: bool = False) -> bool:
+    fd = _open_for_write(path, make_dirs, existing_only)
+    if fd is None:
+        return False
+
+    if isinstance(content, bytes):
+        # Pre-encoded content goes straight to the fd, skipping the text and buffer layers
+        try:
+            view = memoryview(content)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+    else:
+        with open(fd, "w") as f:
+            f.write(content)
+    return True
+
+
+# Keywords rewritten by the code style rules; word boundaries keep identifiers
+# such as "constructor" or "undef " intact
+_TS_ANNOTATION_RE = re.compile(r"\b(function|const)\b")
+_PY_DEF_RE = re.compile(r"\bdef ")
+
+
+# Which code style rule set applies to a source suffix
+_STYLE_LANGUAGES = {".ts": "ts", ".tsx": "ts", ".py": "python"}
+
+
+def _to_camel_case(name: str) -> str:
+    words = name.split("_")
+    return words[0] + "".join(word.capitalize() for word in words[1:])
+
+
+# Naming conventions resolved by dict lookup; unknown conventions keep any name
+_NAMING_APPLIERS: Dict[str, Callable[[str], str]] = {
+    "PascalCase": lambda name: "".join(word.capitalize() for word in name.split("_")),
+    "camelCase": _to_camel_case,
+    "kebab-case": lambda name: name.replace("_", "-").lower(),
+}
+
+
+_COMPONENT_TEST_TEMPLATE = """import {{ render, screen }} from '@testing-library/react'
+import {{ {name} }} from './{name}'
+
+describe('{name}', () => {{
+    it('renders correctly', () => {{
+        render(<{name} />)
+        // Add assertions here
+    }})
+}})
+"""
+
+_MODULE_TEST_TEMPLATE = """import {{ {name} }} from './{name}'
+
+describe('{name}', () => {{
+    it('works correctly', () => {{
+        // Add test cases here
+    }})
+}})
+"""
+
+_PYTHON_TEST_TEMPLATE = """import unittest
+from {name} import *
+
+class Test{title}(unittest.TestCase):
+    def test_functionality(self):
+        # Add test cases here
+        pass
+
+if __name__ == '__main__':
+    unittest.main()
+"""
+
+def _dotted_test_name(stem: str, suffix: str) -> str:
+    return f"{stem}.test{suffix}"
+
+
+def _prefixed_test_name(stem: str, suffix: str) -> str:
+    return f"test_{stem}{suffix}"
+
+
+# Test file naming by source suffix, given the source stem and suffix
+_TEST_NAME_RULES: Dict[str, Callable[[str, str], str]] = {
+    ".tsx": _dotted_test_name,
+    ".ts": _dotted_test_name,
+    ".jsx": _dotted_test_name,
+    ".js": _dotted_test_name,
+    ".py": _prefixed_test_name,
+}
+
+# Generated test file templates by source suffix, formatted with the file's stem
+_TEST_TEMPLATES: Dict[str, str] = {
+    ".tsx": _COMPONENT_TEST_TEMPLATE,
+    ".jsx": _COMPONENT_TEST_TEMPLATE,
+    ".ts": _MODULE_TEST_TEMPLATE,
+    ".js": _MODULE_TEST_TEMPLATE,
+    ".py": _PYTHON_TEST_TEMPLATE,
+}
+
+
+# Fallback content for required files without a configured code template
+_REQUIRED_FILE_DEFAULTS: Dict[str, str] = {
+    ".ts": "export {{}}\n",
+    ".tsx": "export {{}}\n",
+    ".js": "export {{}}\n",
+    ".jsx": "export {{}}\n",
+    ".py": '"""\n{stem} module.\n"""\n',
+    ".md": "# {stem}\n",
+}
+
+
+@functools.lru_cache(maxsize=128)
+def _default_required_file(name: str) -> str:
+    stem, suffix = os.path.splitext(os.path.basename(name))
+    return _REQUIRED_FILE_DEFAULTS.get(suffix, "").format(stem=stem)
+
+
+@functools.lru_cache(maxsize=256)
+def _render_test_file(suffix: str, stem: str) -> bytes:
+    template = _TEST_TEMPLATES.get(suffix)
+    if template is None:
+        return b""
+    return template.format(name=stem, title=stem.title()).encode("utf-8")
+
+
+class _DomainRules(NamedTuple):
+    """Per-domain settings pulled out of tree_focus and developer.domain_rules once."""
+
+    component_convention: Optional[str]
+    naming_convention: Optional[str]
+    file_structure: Optional[Mapping[str, Any]]
+    code_style: Optional[Mapping[str, Any]]
+    require_tests: bool
+    # file_structure.required_files in config order, and as a set for difference checks
+    required_files: Tuple[str, ...]
+    required_set: FrozenSet[str]
+
+    @classmethod
+    def from_config(cls, focus: Mapping[str, Any], rules: Mapping[str, Any]) -> "_DomainRules":
+        file_structure = rules.get("file_structure")
+        required_files = tuple(dict.fromkeys((file_structure or {}).get("required_files", ())))
+        return cls(
+            component_convention=focus.get("naming_conventions", {}).get("components"),
+            naming_convention=rules.get("naming_convention"),
+            file_structure=file_structure,
+            code_style=rules.get("code_style"),
+            require_tests=rules.get("require_tests", True),
+            required_files=required_files,
+            required_set=frozenset(required_files)
+        )
+
+
+_NO_DOMAIN_RULES = _DomainRules(None, None, None, None, True, (), frozenset())
+
 
 class DeveloperAgent(BaseAgent):
-    def __init__(self, config: Dict[str, Any]):
+    needs_full_config = True
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
         super().__init__(config)
-        self.config = self._load_config()
         self.tree_focus = self.config.get("tree_focus", {})
-        self.allowed_actions = self.config.get("agents", {}).get("developer", {}).get("allowed_actions", [])
-        self.domain_rules = self.config.get("agents", {}).get("developer", {}).get("domain_rules", {})
-
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from YAML file."""
-        config_path = Path("config/config.yaml")
-        if not config_path.exists():
-            return {}
-        
-        with open(config_path, "r") as f:
-            return yaml.safe_load(f)
+        developer_config = self.config.get("agents", {}).get("developer", {})
+        self.allowed_actions = frozenset(developer_config.get("allowed_actions", ()))
+        self.domain_rules = developer_config.get("domain_rules", {})
+        self.code_templates = developer_config.get("code_templates", {})
+        self._dir_trie = shared_dir_trie(self.tree_focus)
+        # Action name -> (handler, key of its payload in the input)
+        self._action_handlers: Dict[str, Tuple[Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]], str]] = {
+            "create_component": (self._create_component, "component"),
+            "update_component": (self._update_component, "component"),
+            "implement_feature": (self._implement_feature, "feature"),
+            "fix_issue": (self._fix_issue, "issue")
+        }
+        self._rules_by_domain = {
+            domain: _DomainRules.from_config(self.tree_focus.get(domain, {}), self.domain_rules.get(domain, {}))
+            for domain in {**self.tree_focus, **self.domain_rules}
+        }
+        # Directories this agent has already created, so repeat writes skip makedirs
+        self._created_dirs: Set[str] = set()
+
+    async def _run_writes(self, contents: Dict[str, str], make_dirs: bool = False,
+                          existing_only: bool = False) -> Dict[str, Any]:
+        """Write every path concurrently, returning each path's result or exception."""
+        loop = asyncio.get_running_loop()
+
+        if make_dirs:
+            directories = {os.path.dirname(path) for path in contents} - self._created_dirs
+            directories.discard("")
+            if directories:
+                await loop.run_in_executor(_FILE_EXECUTOR, _make_dirs, sorted(directories))
+                self._created_dirs.update(directories)
+
+        paths = list(contents)
+        results = await asyncio.gather(
+            *(loop.run_in_executor(_FILE_EXECUTOR, _write_text, path, contents[path], make_dirs, existing_only)
+              for path in paths),
+            return_exceptions=True
+        )
+        return dict(zip(paths, results))
+
+    async def _write_files(self, writes: List[Tuple[str, str]],
+                           make_dirs: bool = False) -> Optional[Tuple[str, Exception]]:
+        """Write (path, content) pairs concurrently.
+
+        Returns the first failing path in input order with its exception, or
+        None when every write succeeded. A path listed twice keeps its last
+        content, as it would have with sequential writes.
+        """
+        results = await self._run_writes(dict(writes), make_dirs=make_dirs)
+        for path, _ in writes:
+            if isinstance(results[path], Exception):
+                return path, results[path]
+        return None
+
+    async def _overwrite_files(self, writes: List[Tuple[str, str]]) -> Tuple[List[str], Optional[Tuple[str, Exception]]]:
+        """Like _write_files, but only rewrites paths that already exist.
+
+        Returns the paths that were rewritten along with the first failure, if any.
+        """
+        results = await self._run_writes(dict(writes), existing_only=True)
+        updated = []
+        for path, _ in writes:
+            result = results[path]
+            if isinstance(result, Exception):
+                return updated, (path, result)
+            if result:
+                updated.append(path)
+        return updated, None
 
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         action = input_data.get("action")
         if action not in self.allowed_actions:
             return {"error": f"Action not allowed: {action}"}
 
-        if action == "create_component":
-            return await self._create_component(input_data["component"])
-        elif action == "update_component":
-            return await self._update_component(input_data["component"])
-        elif action == "implement_feature":
-            return await self._implement_feature(input_data["feature"])
-        elif action == "fix_issue":
-            return await self._fix_issue(input_data["issue"])
-        return {"error": "Unknown action"}
+        entry = self._action_handlers.get(action)
+        if entry is None:
+            return {"error": "Unknown action"}
+        handler, payload_key = entry
+        return await handler(input_data[payload_key])
 
     async def _create_component(self, component: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new component following domain-specific rules."""
@@ -58,51 +303,49 @@ class DeveloperAgent(BaseAgent):
         # Apply domain-specific rules
         component = self._apply_domain_rules(component, domain)
         
-        # Create component files
-        created_files = []
+        # Check every path against domain rules before writing anything
+        writes = []
         for file_spec in component.get("files", []):
             file_path = file_spec.get("path")
             if not file_path:
                 continue
 
-            # Check if path follows domain rules
-            if not any(file_path.startswith(dir) for dir in self.tree_focus[domain]["directories"]):
+            if not self._dir_trie.contains_prefix(file_path, domain):
                 return {
                     "status": "error",
                     "error": "Invalid file path",
                     "details": f"File must be in one of {self.tree_focus[domain]['directories']}"
                 }
+            writes.append((file_path, file_spec.get("content", "")))
 
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-            # Create file with content
-            try:
-                with open(file_path, "w") as f:
-                    f.write(file_spec.get("content", ""))
-                created_files.append(file_path)
-            except Exception as e:
-                return {
-                    "status": "error",
-                    "error": f"Failed to create file {file_path}",
-                    "details": str(e)
-                }
+        # Create component files
+        failure = await self._write_files(writes, make_dirs=True)
+        if failure:
+            file_path, e = failure
+            return {
+                "status": "error",
+                "error": f"Failed to create file {file_path}",
+                "details": str(e)
+            }
+        created_files = [file_path for file_path, _ in writes]
 
         # Create tests if required
-        if self.domain_rules.get(domain, {}).get("require_tests", True):
+        if self._rules_by_domain.get(domain, _NO_DOMAIN_RULES).require_tests:
+            test_writes = []
             for file_path in created_files:
                 test_path = self._get_test_path(file_path)
                 if test_path:
-                    try:
-                        with open(test_path, "w") as f:
-                            f.write(self._generate_test_content(file_path))
-                        created_files.append(test_path)
-                    except Exception as e:
-                        return {
-                            "status": "error",
-                            "error": f"Failed to create test file {test_path}",
-                            "details": str(e)
-                        }
+                    test_writes.append((test_path, self._generate_test_bytes(file_path)))
+
+            failure = await self._write_files(test_writes)
+            if failure:
+                test_path, e = failure
+                return {
+                    "status": "error",
+                    "error": f"Failed to create test file {test_path}",
+                    "details": str(e)
+                }
+            created_files.extend(test_path for test_path, _ in test_writes)
 
         return {
             "status": "success",
@@ -120,72 +363,80 @@ class DeveloperAgent(BaseAgent):
 
         # If not found or invalid, try to infer from file paths
         for file_spec in component.get("files", []):
-            file_path = file_spec.get("path", "")
-            for domain, rules in self.tree_focus.items():
-                if any(file_path.startswith(dir) for dir in rules["directories"]):
-                    return domain
+            domain = self._dir_trie.first_domain(file_spec.get("path", ""))
+            if domain is not None:
+                return domain
 
         return None
 
     def _apply_domain_rules(self, component: Dict[str, Any], domain: str) -> Dict[str, Any]:
         """Apply domain-specific rules to component structure."""
-        rules = self.domain_rules.get(domain, {})
+        rules = self._rules_by_domain.get(domain, _NO_DOMAIN_RULES)
         
         # Apply naming conventions
-        if "naming_convention" in rules:
+        if rules.naming_convention is not None:
             component["name"] = self._apply_naming_convention(
                 component["name"],
-                rules["naming_convention"]
+                rules.naming_convention
             )
 
         # Apply file structure rules
-        if "file_structure" in rules:
+        if rules.file_structure is not None:
             component["files"] = self._apply_file_structure(
                 component.get("files", []),
-                rules["file_structure"]
+                rules
             )
 
         # Apply code style rules
-        if "code_style" in rules:
-            component = self._apply_code_style(component, rules["code_style"])
+        if rules.code_style is not None:
+            component = self._apply_code_style(component, rules.code_style)
 
         return component
 
     def _apply_naming_convention(self, name: str, convention: str) -> str:
         """Apply naming convention to component name."""
-        if convention == "PascalCase":
-            return "".join(word.capitalize() for word in name.split("_"))
-        elif convention == "camelCase":
-            words = name.split("_")
-            return words[0] + "".join(word.capitalize() for word in words[1:])
-        elif convention == "kebab-case":
-            return name.replace("_", "-").lower()
-        return name
-
-    def _apply_file_structure(self, files: List[Dict[str, Any]], structure_rules: Dict[str, Any]) -> List[Dict[str, Any]]:
+        applier = _NAMING_APPLIERS.get(convention)
+        return applier(name) if applier else name
+
+    def _apply_file_structure(self, files: List[Dict[str, Any]], rules: _DomainRules) -> List[Dict[str, Any]]:
         """Apply file structure rules to component files."""
-        required_files = structure_rules.get("required_files", [])
-        
         # Ensure all required files exist
-        existing_files = {f.get("path", "").split("/")[-1] for f in files}
-        for required in required_files:
-            if required not in existing_files:
-                files.append({
-                    "path": f"{required}",
-                    "content": self._get_template_content(required)
-                })
+        missing = rules.required_set.difference(f.get("path", "").rpartition("/")[2] for f in files)
+        if missing:
+            files.extend(
+                {"path": required, "content": self._get_template_content(required)}
+                for required in rules.required_files
+                if required in missing
+            )
 
         return files
 
+    def _get_template_content(self, name: str) -> str:
+        """Get starter content for a required file.
+
+        agents.developer.code_templates can supply content per file name;
+        otherwise a minimal default is picked by suffix.
+        """
+        template = self.code_templates.get(name)
+        if template is not None:
+            return template
+        return _default_required_file(name)
+
     def _apply_code_style(self, component: Dict[str, Any], style_rules: Dict[str, Any]) -> Dict[str, Any]:
         """Apply code style rules to component."""
+        buckets: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         for file in component.get("files", []):
-            if file.get("path", "").endswith((".ts", ".tsx")):
-                # Apply TypeScript/React specific rules
-                file["content"] = self._apply_ts_rules(file["content"], style_rules)
-            elif file.get("path", "").endswith(".py"):
-                # Apply Python specific rules
-                file["content"] = self._apply_python_rules(file["content"], style_rules)
+            language = _STYLE_LANGUAGES.get(os.path.splitext(file.get("path", ""))[1])
+            if language:
+                buckets[language].append(file)
+
+        # Apply TypeScript/React specific rules
+        for file in buckets["ts"]:
+            file["content"] = self._apply_ts_rules(file["content"], style_rules)
+
+        # Apply Python specific rules
+        for file in buckets["python"]:
+            file["content"] = self._apply_python_rules(file["content"], style_rules)
 
         return component
 
@@ -193,8 +444,7 @@ class DeveloperAgent(BaseAgent):
         """Apply TypeScript code style rules."""
         if rules.get("use_typescript", True):
             # Add type annotations
-            content = content.replace("function", "function:")
-            content = content.replace("const", "const:")
+            content = _TS_ANNOTATION_RE.sub(r"\1:", content)
 
         if rules.get("use_strict", True):
             content = "'use strict';\n" + content
@@ -205,7 +455,7 @@ class DeveloperAgent(BaseAgent):
         """Apply Python code style rules."""
         if rules.get("type_hints", True):
             # Add type hints
-            content = content.replace("def ", "def -> None:")
+            content = _PY_DEF_RE.sub("def -> None:", content)
 
         if rules.get("docstrings", True):
             # Add docstring template
@@ -228,62 +478,18 @@ class DeveloperAgent(BaseAgent):
 
             # Create test file
             os.makedirs(os.path.dirname(test_path), exist_ok=True)
-            with open(test_path, "w") as f:
-                f.write(self._generate_test_content(file, domain))
+            with open(test_path, "wb") as f:
+                f.write(self._generate_test_bytes(file_path))
             test_files.append(test_path)
 
         return test_files
 
-    def _get_test_file_path(self, file_path: str) -> str:
+    def _get_test_file_path(self, file_path: str) -> Optional[str]:
         """Get the test file path for a source file."""
-        path = Path(file_path)
-        if path.suffix in [".ts", ".tsx"]:
-            return str(path.parent / f"{path.stem}.test{path.suffix}")
-        elif path.suffix == ".py":
-            return str(path.parent / f"test_{path.stem}{path.suffix}")
-        return None
-
-    def _generate_test_content(self, file: Dict[str, Any], domain: str) -> str:
-        """Generate test content based on file type and domain."""
-        if file["path"].endswith((".ts", ".tsx")):
-            return self._generate_ts_test(file, domain)
-        elif file["path"].endswith(".py"):
-            return self._generate_python_test(file, domain)
-        return ""
-
-    def _generate_ts_test(self, file: Dict[str, Any], domain: str) -> str:
-        """Generate TypeScript test content."""
-        component_name = Path(file["path"]).stem
-        
-        return f"""import {{ render, screen }} from '@testing-library/react'
-import {{ {component_name} }} from './{component_name}'
-
-describe('{component_name}', () => {{
-    it('renders correctly', () => {{
-        render(<{component_name} />)
-        // Add assertions here
-    }})
-}})
-"""
-
-    def _generate_python_test(self, file: Dict[str, Any], domain: str) -> str:
-        """Generate Python test content."""
-        module_name = Path(file["path"]).stem
-        
-        return f"""import unittest
-from {module_name} import *
-
-class Test{module_name.capitalize()}(unittest.TestCase):
-    def setUp(self):
-        pass
-
-    def test_basic_functionality(self):
-        # Add test cases here
-        pass
-
-if __name__ == '__main__':
-    unittest.main()
-"""
+        directory, name = os.path.split(file_path)
+        stem, suffix = os.path.splitext(name)
+        rule = _TEST_NAME_RULES.get(suffix)
+        return os.path.join(directory, rule(stem, suffix)) if rule else None
 
     async def _update_component(self, component: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing component."""
@@ -294,32 +500,31 @@ if __name__ == '__main__':
         if not domain:
             return {"error": "Component domain not recognized"}
 
-        # Apply updates
-        updated_files = []
-        for file_spec in component.get("files", []):
-            file_path = file_spec.get("path")
-            if not file_path or not os.path.exists(file_path):
-                continue
-
-            try:
-                # Update file content
-                with open(file_path, "w") as f:
-                    f.write(file_spec.get("content", ""))
-                updated_files.append(file_path)
-
-                # Update corresponding test file if it exists
-                test_path = self._get_test_file_path(file_path)
-                if test_path and os.path.exists(test_path):
-                    with open(test_path, "w") as f:
-                        f.write(self._generate_test_content(file_spec, domain))
-                    updated_files.append(test_path)
-
-            except Exception as e:
-                return {"error": f"Failed to update file {file_path}", "details": str(e)}
+        # Apply updates to files that already exist
+        writes = [
+            (file_spec["path"], file_spec.get("content", ""))
+            for file_spec in component.get("files", [])
+            if file_spec.get("path")
+        ]
+        updated, failure = await self._overwrite_files(writes)
+        if failure:
+            file_path, e = failure
+            return {"error": f"Failed to update file {file_path}", "details": str(e)}
+
+        # Regenerate the test files that exist for updated sources
+        test_writes = []
+        for file_path in updated:
+            test_path = self._get_test_file_path(file_path)
+            if test_path:
+                test_writes.append((test_path, self._generate_test_bytes(file_path)))
+        updated_tests, failure = await self._overwrite_files(test_writes)
+        if failure:
+            file_path, e = failure
+            return {"error": f"Failed to update file {file_path}", "details": str(e)}
 
         return {
             "status": "updated",
-            "files": updated_files,
+            "files": updated + updated_tests,
             "domain": domain
         }
 
@@ -354,44 +559,40 @@ if __name__ == '__main__':
 
     async def _fix_issue(self, issue: Dict[str, Any]) -> Dict[str, Any]:
         """Fix an issue in the codebase."""
-        files = []
-        
-        # Apply fixes to files
-        for file_spec in issue.get("files", []):
-            file_path = file_spec.get("path")
-            if not file_path:
-                continue
-
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-            # Create or update file with content
-            try:
-                with open(file_path, "w") as f:
-                    f.write(file_spec.get("content", ""))
-                files.append(file_path)
-            except Exception as e:
-                return {
-                    "status": "error",
-                    "error": f"Failed to update file {file_path}",
-                    "details": str(e)
-                }
+        writes = [
+            (file_spec["path"], file_spec.get("content", ""))
+            for file_spec in issue.get("files", [])
+            if file_spec.get("path")
+        ]
+
+        # Create or update files with content
+        failure = await self._write_files(writes, make_dirs=True)
+        if failure:
+            file_path, e = failure
+            return {
+                "status": "error",
+                "error": f"Failed to update file {file_path}",
+                "details": str(e)
+            }
+        files = [file_path for file_path, _ in writes]
 
         # Update tests if required
         if issue.get("update_tests", False):
+            test_writes = []
             for file_path in files:
                 test_path = self._get_test_path(file_path)
                 if test_path:
-                    try:
-                        with open(test_path, "w") as f:
-                            f.write(self._generate_test_content(file_path))
-                        files.append(test_path)
-                    except Exception as e:
-                        return {
-                            "status": "error",
-                            "error": f"Failed to update test file {test_path}",
-                            "details": str(e)
-                        }
+                    test_writes.append((test_path, self._generate_test_bytes(file_path)))
+
+            failure = await self._write_files(test_writes)
+            if failure:
+                test_path, e = failure
+                return {
+                    "status": "error",
+                    "error": f"Failed to update test file {test_path}",
+                    "details": str(e)
+                }
+            files.extend(test_path for test_path, _ in test_writes)
 
         return {
             "status": "success",
@@ -400,67 +601,17 @@ if __name__ == '__main__':
 
     def _get_test_path(self, file_path: str) -> Optional[str]:
         """Get the test file path for a given file."""
-        path = Path(file_path)
-        if ".test." in path.name:
+        if ".test." in os.path.basename(file_path):
             return None
-            
-        if path.suffix in [".tsx", ".ts", ".jsx", ".js"]:
-            return str(path.parent / f"{path.stem}.test{path.suffix}")
-        elif path.suffix == ".py":
-            return str(path.parent / f"test_{path.stem}.py")
-        return None
+        return self._get_test_file_path(file_path)
 
-    def _generate_test_content(self, file_path: str) -> str:
-        """Generate test content for a file."""
-        path = Path(file_path)
-        if path.suffix in [".tsx", ".jsx"]:
-            component_name = path.stem
-            return f"""import {{ render, screen }} from '@testing-library/react'
-import {{ {component_name} }} from './{component_name}'
-
-describe('{component_name}', () => {{
-    it('renders correctly', () => {{
-        render(<{component_name} />)
-        // Add assertions here
-    }})
-}})
-"""
-        elif path.suffix in [".ts", ".js"]:
-            module_name = path.stem
-            return f"""import {{ {module_name} }} from './{module_name}'
-
-describe('{module_name}', () => {{
-    it('works correctly', () => {{
-        // Add test cases here
-    }})
-}})
-"""
-        elif path.suffix == ".py":
-            module_name = path.stem
-            return f"""import unittest
-from {module_name} import *
-
-class Test{module_name.title()}(unittest.TestCase):
-    def test_functionality(self):
-        # Add test cases here
-        pass
-
-if __name__ == '__main__':
-    unittest.main()
-"""
-        return ""
+    def _generate_test_bytes(self, file_path: str) -> bytes:
+        """Generate UTF-8 encoded test content for a file, rendered once per name."""
+        stem, suffix = os.path.splitext(os.path.basename(file_path))
+        return _render_test_file(suffix, stem)
 
     def _validate_naming_convention(self, name: str, domain: str) -> bool:
         """Validate component name against domain naming convention."""
-        convention = self.tree_focus[domain]["naming_conventions"]["components"]
-        
-        if convention == "PascalCase":
-            return name[0].isupper() and "_" not in name
-        elif convention == "camelCase":
-            return name[0].islower() and "_" not in name
-        elif convention == "kebab-case":
-            return name.islower() and "_" not in name and "-" in name
-        elif convention == "snake_case":
-            return name.islower() and "_" in name
-        
-        return True 
\ No newline at end of file
+        convention = self._rules_by_domain.get(domain, _NO_DOMAIN_RULES).component_convention
+        validator = NAMING_VALIDATORS.get(convention)
+        return validator(name) if validator else True 
\ No newline at end of file
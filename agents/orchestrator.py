@@ -1,168 +1,282 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Awaitable, Callable, List, Mapping, Optional, Tuple
+import os
 import asyncio
-import yaml
-from pathlib import Path
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from .base_agent import BaseAgent
 from .developer import DeveloperAgent
 from .reviewer import ReviewerAgent
 
+logger = logging.getLogger(__name__)
+
+# Files handed to the reviewer are read here concurrently, off the event loop
+_READ_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="review-reader")
+
+
+def _read_text(file_path: str) -> str:
+    with open(file_path, "r") as f:
+        return f.read()
+
+
+def _read_text_if_changed(file_path: str, cached: Optional[Tuple[int, int, str]]) -> Tuple[int, int, str]:
+    """Return (mtime_ns, size, content), reusing cached content while the file is unchanged."""
+    st = os.stat(file_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached
+    return st.st_mtime_ns, st.st_size, _read_text(file_path)
+
+
+# Written or reviewed file lists in a step result
+_RESULT_FILE_KEYS = ("files", "created", "updated")
+
+
 class WorkflowError(Exception):
     """Custom exception for workflow errors."""
     pass
 
 class OrchestratorAgent(BaseAgent):
-    def __init__(self, config: Dict[str, Any]):
+    needs_full_config = True
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
         super().__init__(config)
-        self.config = self._load_config()
         self.workflows = self.config.get("workflows", {})
-        self.developer = DeveloperAgent(config)
-        self.reviewer = ReviewerAgent(config)
-
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from YAML file."""
-        config_path = Path("config/config.yaml")
-        if not config_path.exists():
-            return {}
-        
-        with open(config_path, "r") as f:
-            return yaml.safe_load(f)
+        # Per workflow: the steps list planned, and its layers or why it was
+        # rejected, so resubmitting it neither re-plans nor re-validates
+        self._workflow_plans: Dict[str, Tuple[List[Dict[str, Any]], Optional[List[List[Dict[str, Any]]]], Optional[str]]] = {}
+        self.developer = DeveloperAgent(self.config)
+        self.reviewer = ReviewerAgent(self.config)
+        self._agents: Dict[str, BaseAgent] = {
+            "developer": self.developer,
+            "reviewer": self.reviewer
+        }
+        # Extra input some step types need before their agent runs
+        self._step_prep: Dict[str, Callable[[Dict[str, Any], Dict[str, Any], Dict[str, Tuple[int, int, str]]],
+                                            Awaitable[None]]] = {
+            "review_code": self._prep_review_code,
+            "verify_fix": self._prep_verify_fix
+        }
 
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         workflow_name = input_data.get("workflow")
         if not workflow_name or workflow_name not in self.workflows:
             raise WorkflowError(f"Unknown workflow: {workflow_name}")
 
-        workflow = self.workflows[workflow_name]
-        return await self._execute_workflow(workflow, input_data)
+        return await self._execute_workflow(self._plan_workflow(workflow_name), input_data)
+
+    def _plan_workflow(self, workflow_name: str) -> List[List[Dict[str, Any]]]:
+        """Group a workflow's steps into layers that can run concurrently.
+
+        A step may name the steps it needs with ``depends_on`` (matched against
+        each step's ``id``, or its ``type`` when it has no id). A step without
+        ``depends_on`` waits for every step before it, so workflows that don't
+        declare dependencies keep running strictly in order.
+
+        Plans are cached against the workflow's steps list, so a workflow whose
+        definition or steps are replaced is planned again.
+        """
+        steps = self.workflows[workflow_name]["steps"]
+        cached = self._workflow_plans.get(workflow_name)
+        if cached is not None and cached[0] is steps:
+            _, layers, error = cached
+            if error is not None:
+                raise WorkflowError(error)
+            return layers
+
+        try:
+            layers = self._build_layers(workflow_name, steps)
+        except WorkflowError as e:
+            self._workflow_plans[workflow_name] = (steps, None, str(e))
+            raise
+        self._workflow_plans[workflow_name] = (steps, layers, None)
+        return layers
 
-    async def _execute_workflow(self, workflow: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a workflow based on its definition."""
+    def _build_layers(self, workflow_name: str, steps: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Validate a workflow's dependencies and sort its steps into layers."""
+        ids: Dict[str, List[int]] = {}
+        for index, step in enumerate(steps):
+            ids.setdefault(step.get("id", step["type"]), []).append(index)
+
+        dependencies: List[List[int]] = []
+        for index, step in enumerate(steps):
+            if "depends_on" not in step:
+                dependencies.append(list(range(index)))
+                continue
+            needed = []
+            for name in step["depends_on"]:
+                if name not in ids:
+                    raise WorkflowError(f"Step {step['type']} depends on unknown step: {name}")
+                # Ids default to the step type, so a name may cover this step too;
+                # it means the other steps sharing that name
+                others = [dep for dep in ids[name] if dep != index]
+                if not others:
+                    raise WorkflowError(f"Step {step['type']} in workflow {workflow_name} depends on itself")
+                needed.extend(others)
+            dependencies.append(needed)
+
+        # Layer of a step is one past the deepest layer it depends on
+        depth: Dict[int, int] = {}
+        visiting = set()
+
+        def layer_of(index: int) -> int:
+            if index in depth:
+                return depth[index]
+            if index in visiting:
+                raise WorkflowError(f"Workflow {workflow_name} has a dependency cycle")
+            visiting.add(index)
+            depth[index] = 1 + max((layer_of(dep) for dep in dependencies[index]), default=-1)
+            visiting.discard(index)
+            return depth[index]
+
+        layers = []
+        for index, step in enumerate(steps):
+            layer = layer_of(index)
+            while len(layers) <= layer:
+                layers.append([])
+            layers[layer].append(step)
+
+        return layers
+
+    async def _execute_workflow(self, layers: List[List[Dict[str, Any]]], input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a planned workflow layer by layer."""
         results = []
         current_state = input_data.copy()
+        # Review reads shared by every step of this run, validated by mtime and size
+        file_cache: Dict[str, Tuple[int, int, str]] = {}
+
+        logger.debug("Starting workflow execution with input: %r", input_data)
+        logger.debug("Workflow layers: %r", layers)
+
+        for layer in layers:
+            # Steps in a layer only read the state, so they can share it while running
+            if len(layer) == 1:
+                outcomes = [await self._run_step(layer[0], current_state, file_cache)]
+            else:
+                outcomes = await asyncio.gather(*(self._run_step(step, current_state, file_cache) for step in layer))
+
+            # Merge in step order so results and state match a sequential run
+            for step, (result, updates, failure) in zip(layer, outcomes):
+                if result is not None:
+                    results.append({
+                        "step": step["type"],
+                        "agent": step.get("agent", "developer"),
+                        "result": result
+                    })
+                if updates is not None:
+                    current_state.update(updates)
+                    logger.debug("Updated state: %r", current_state)
+                if failure is not None:
+                    return {**failure, "partial_results": results}
+
+        logger.debug("Workflow completed successfully")
+        return {
+            "status": "completed",
+            "results": results
+        }
+
+    async def _run_step(self, step: Dict[str, Any], current_state: Dict[str, Any],
+                        file_cache: Dict[str, Tuple[int, int, str]]
+                        ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Run a single workflow step against the current state.
 
-        print(f"Starting workflow execution with input: {input_data}")
-        print(f"Workflow steps: {workflow['steps']}")
-
-        for step in workflow["steps"]:
-            step_type = step["type"]
-            agent = step.get("agent", "developer")
-            
-            print(f"\nExecuting step: {step_type} with agent: {agent}")
-            print(f"Current state: {current_state}")
-            
-            try:
-                # Prepare input for agent
-                agent_input = {
-                    "action": step_type,
-                    **step.get("params", {}),
-                    **current_state
+        Returns the step's result and the state updates it makes when it
+        completed, and a failure payload when the workflow has to stop; a step
+        that fails its review returns all three.
+        """
+        step_type = step["type"]
+        agent = step.get("agent", "developer")
+        completed = None
+        updates = None
+
+        logger.debug("Executing step: %s with agent: %s", step_type, agent)
+        logger.debug("Current state: %r", current_state)
+
+        try:
+            # Prepare input for agent
+            agent_input = {
+                "action": step_type,
+                **step.get("params", {}),
+                **current_state
+            }
+
+            # Add code for review or the fix to verify if needed
+            prep = self._step_prep.get(step_type)
+            if prep is not None:
+                await prep(agent_input, current_state, file_cache)
+            logger.debug("Agent input: %r", agent_input)
+
+            # Execute agent action
+            handler = self._agents.get(agent)
+            if handler is None:
+                return None, None, {
+                    "status": "error",
+                    "error": f"Unknown agent type: {agent}"
                 }
+            result = await handler.process(agent_input)
 
-                print(f"Agent input: {agent_input}")
-
-                # Add code for review if needed
-                if step_type == "review_code":
-                    files = []
-                    for file_path in current_state.get("files", []):
-                        try:
-                            with open(file_path, "r") as f:
-                                content = f.read()
-                                files.append({
-                                    "path": file_path,
-                                    "content": content
-                                })
-                        except Exception as e:
-                            print(f"Failed to read file {file_path}: {str(e)}")
-                            continue
-                    
-                    agent_input["code"] = {
-                        "files": files
-                    }
-                    print(f"Added code for review: {agent_input['code']}")
-                elif step_type == "verify_fix":
-                    agent_input["fix"] = {
-                        "files": current_state.get("files", []),
-                        "update_tests": current_state.get("issue", {}).get("update_tests", False)
-                    }
-                    print(f"Added fix for verification: {agent_input['fix']}")
-
-                # Execute agent action
-                if agent == "developer":
-                    result = await self.developer.process(agent_input)
-                elif agent == "reviewer":
-                    result = await self.reviewer.process(agent_input)
-                else:
-                    return {
-                        "status": "error",
-                        "error": f"Unknown agent type: {agent}",
-                        "partial_results": results
-                    }
+            logger.debug("Agent result: %r", result)
 
-                print(f"Agent result: {result}")
-
-                # Handle agent result
-                if result.get("status") == "error":
-                    if "Invalid naming convention" in result.get("error", "") or "Invalid file path" in result.get("error", ""):
-                        return {
-                            "status": "review_failed",
-                            "step": step_type,
-                            "review_feedback": [result.get("error")],
-                            "partial_results": results
-                        }
-                    else:
-                        print(f"Error in step {step_type}: {result.get('error')}")
-                        return {
-                            "status": "error",
-                            "error": f"Workflow failed at step {step_type}",
-                            "details": result.get("error"),
-                            "partial_results": results
-                        }
-                elif result.get("status") == "failed":
-                    print(f"Step {step_type} failed validation: {result.get('issues', [])}")
-                    return {
+            # Whatever the step wrote must be read fresh by later reviews
+            for key in _RESULT_FILE_KEYS:
+                for file_path in result.get(key, ()):
+                    file_cache.pop(file_path, None)
+
+            # Handle agent result
+            if result.get("status") == "error":
+                if "Invalid naming convention" in result.get("error", "") or "Invalid file path" in result.get("error", ""):
+                    return None, None, {
                         "status": "review_failed",
                         "step": step_type,
-                        "review_feedback": result.get("issues", []),
-                        "partial_results": results
+                        "review_feedback": [result.get("error")]
                     }
-
-                results.append({
-                    "step": step_type,
-                    "agent": agent,
-                    "result": result
-                })
-
-                # Update current state with step results
-                updates = self._extract_state_updates(step, result)
-                current_state.update(updates)
-                print(f"Updated state: {current_state}")
-
-                # Check if we need to wait for review
-                if step.get("require_review", False):
-                    print(f"Performing review for step {step_type}")
-                    review_result = await self._perform_review(result, step)
-                    print(f"Review result: {review_result}")
-                    if not review_result.get("approved", False):
-                        return {
-                            "status": "review_failed",
-                            "step": step_type,
-                            "review_feedback": review_result.get("feedback"),
-                            "partial_results": results
-                        }
-
-            except Exception as e:
-                print(f"Exception in step {step_type}: {str(e)}")
-                return {
+                logger.warning("Error in step %s: %s", step_type, result.get("error"))
+                return None, None, {
                     "status": "error",
-                    "error": f"Workflow step {step_type} failed",
-                    "details": str(e),
-                    "partial_results": results
+                    "error": f"Workflow failed at step {step_type}",
+                    "details": result.get("error")
+                }
+            elif result.get("status") == "failed":
+                logger.info("Step %s failed validation: %r", step_type, result.get("issues", []))
+                return None, None, {
+                    "status": "review_failed",
+                    "step": step_type,
+                    "review_feedback": result.get("issues", [])
                 }
+            completed = result
+            updates = self._extract_state_updates(step, result)
 
-        print("\nWorkflow completed successfully")
-        return {
-            "status": "completed",
-            "results": results
+            # Check if we need to wait for review
+            if step.get("require_review", False):
+                logger.debug("Performing review for step %s", step_type)
+                review_result = await self._perform_review(result, step, file_cache)
+                logger.debug("Review result: %r", review_result)
+                if not review_result.get("approved", False):
+                    return completed, updates, {
+                        "status": "review_failed",
+                        "step": step_type,
+                        "review_feedback": review_result.get("feedback")
+                    }
+
+        except Exception as e:
+            logger.warning("Exception in step %s: %s", step_type, e)
+            return completed, updates, {
+                "status": "error",
+                "error": f"Workflow step {step_type} failed",
+                "details": str(e)
+            }
+
+        return completed, updates, None
+
+    async def _prep_review_code(self, agent_input: Dict[str, Any], current_state: Dict[str, Any],
+                                file_cache: Dict[str, Tuple[int, int, str]]) -> None:
+        agent_input["code"] = {
+            "files": await self._prepare_files_for_review(current_state.get("files", []), file_cache)
+        }
+
+    async def _prep_verify_fix(self, agent_input: Dict[str, Any], current_state: Dict[str, Any],
+                               file_cache: Dict[str, Tuple[int, int, str]]) -> None:
+        agent_input["fix"] = {
+            "files": current_state.get("files", []),
+            "update_tests": current_state.get("issue", {}).get("update_tests", False)
         }
 
     def _extract_state_updates(self, step: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
@@ -184,7 +298,8 @@ class OrchestratorAgent(BaseAgent):
 
         return updates
 
-    async def _perform_review(self, result: Dict[str, Any], step: Dict[str, Any]) -> Dict[str, Any]:
+    async def _perform_review(self, result: Dict[str, Any], step: Dict[str, Any],
+                              file_cache: Optional[Dict[str, Tuple[int, int, str]]] = None) -> Dict[str, Any]:
         """Perform review of step results."""
         review_type = step.get("review_type", "code_review")
         
@@ -196,12 +311,11 @@ class OrchestratorAgent(BaseAgent):
         }
 
         # Prepare files for review
-        if "files" in result:
-            review_input["code"]["files"].extend(self._prepare_files_for_review(result["files"]))
-        if "created" in result:
-            review_input["code"]["files"].extend(self._prepare_files_for_review(result["created"]))
-        if "updated" in result:
-            review_input["code"]["files"].extend(self._prepare_files_for_review(result["updated"]))
+        review_input["code"]["files"] = await self._prepare_files_for_review([
+            file_path
+            for key in _RESULT_FILE_KEYS
+            for file_path in result.get(key, [])
+        ], file_cache)
 
         # Add any specific review parameters
         review_input.update(step.get("review_params", {}))
@@ -221,20 +335,32 @@ class OrchestratorAgent(BaseAgent):
             "feedback": review_result.get("suggestions", [])
         }
 
-    def _prepare_files_for_review(self, files: List[str]) -> List[Dict[str, Any]]:
-        """Prepare files for review by reading their content."""
+    async def _prepare_files_for_review(self, files: List[str],
+                                        file_cache: Optional[Dict[str, Tuple[int, int, str]]] = None) -> List[Dict[str, Any]]:
+        """Prepare files for review by reading their content concurrently.
+
+        With a file_cache, files unchanged since an earlier step read them are
+        only stat'ed, not read again.
+        """
+        if file_cache is None:
+            file_cache = {}
+        loop = asyncio.get_running_loop()
+        entries = await asyncio.gather(
+            *(loop.run_in_executor(_READ_EXECUTOR, _read_text_if_changed, file_path, file_cache.get(file_path))
+              for file_path in files),
+            return_exceptions=True
+        )
+
         prepared_files = []
-        
-        for file_path in files:
-            try:
-                with open(file_path, "r") as f:
-                    content = f.read()
-                    prepared_files.append({
-                        "path": file_path,
-                        "content": content
-                    })
-            except Exception as e:
-                self.log(f"Failed to read file {file_path}: {str(e)}")
+        for file_path, entry in zip(files, entries):
+            if isinstance(entry, Exception):
+                file_cache.pop(file_path, None)
+                self.log(f"Failed to read file {file_path}: {str(entry)}")
                 continue
+            file_cache[file_path] = entry
+            prepared_files.append({
+                "path": file_path,
+                "content": entry[2]
+            })
 
         return prepared_files 
\ No newline at end of file
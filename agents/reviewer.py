@@ -1,28 +1,56 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, FrozenSet, Iterable, Mapping, Optional, Tuple
 import os
+import re
 import json
-import yaml
-import aiohttp
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from .base_agent import BaseAgent
+from ._dir_trie import shared_dir_trie
+
+# Files checked by _verify_fix are read here, off the event loop
+_READ_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fix-reader")
+
+# Content checks per domain, each matched in a single pass over the file.
+# No pattern can overlap another, so finditer reports every one present.
+_FRONTEND_CHECKS_RE = re.compile(r"(?P<cls>class )|(?P<var>var )|(?P<react>React\.Component)")
+_BACKEND_CHECKS_RE = re.compile(r"(?P<print>print\()|(?P<bare_except>except:)")
+
+
+def _read_with_size(file_path: str) -> Tuple[str, int]:
+    """Read a file's text and its size on disk from a single open."""
+    with open(file_path, "r") as f:
+        return f.read(), os.fstat(f.fileno()).st_size
+
+
+@lru_cache(maxsize=256)
+def _test_coverage(paths: FrozenSet[str]) -> float:
+    # This is a simplified implementation
+    test_files = [f for f in paths if ".test." in f or "test_" in f]
+    return 100.0 if test_files else 0.0
+
 
 class ReviewerAgent(BaseAgent):
-    def __init__(self, config: Dict[str, Any]):
+    # Seconds a single health check may take before the service counts as unhealthy
+    health_check_timeout = 10.0
+
+    needs_full_config = True
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
         super().__init__(config)
-        self.config = self._load_config()
         self.tree_focus = self.config.get("tree_focus", {})
-        self.review_rules = self.config.get("agents", {}).get("reviewer", {}).get("review_rules", {})
-        self.allowed_actions = self.config.get("agents", {}).get("reviewer", {}).get("allowed_actions", [])
-
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from YAML file."""
-        config_path = Path("config/config.yaml")
-        if not config_path.exists():
-            return {}
-        
-        with open(config_path, "r") as f:
-            return yaml.safe_load(f)
+        self._dir_trie = shared_dir_trie(self.tree_focus)
+        # Paths repeat across reviews of the same workflow, so classify each once
+        self._domain_lookup = lru_cache(maxsize=4096)(self._dir_trie.first_domain)
+        reviewer_config = self.config.get("agents", {}).get("reviewer", {})
+        self.review_rules = reviewer_config.get("review_rules", {})
+        # Rules read for every reviewed file, resolved once with their defaults
+        self._max_function_length = int(self.review_rules.get("max_function_length", 50))
+        self._max_file_size = int(self.review_rules.get("max_file_size", 1000000))
+        self._require_tests = bool(self.review_rules.get("required_tests", True))
+        self._coverage_threshold = float(self.review_rules.get("coverage_threshold", 80))
+        self.allowed_actions = frozenset(reviewer_config.get("allowed_actions", ()))
 
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         action = input_data.get("action")
@@ -58,24 +86,21 @@ class ReviewerAgent(BaseAgent):
                 })
                 continue
 
-            # Check if path follows domain rules
-            if not any(file_path.startswith(dir) for dir in self.tree_focus[domain]["directories"]):
+            # The domain came from matching one of its directories, so the
+            # path already satisfies the domain's directory rules
+
+            # Validate file size; one stat covers both existence and size
+            try:
+                size = os.stat(file_path).st_size
+            except OSError:
+                size = None
+            if size is not None and size > self._max_file_size:
                 review_results["issues"].append({
-                    "type": "file_path",
+                    "type": "file_size",
                     "file": file_path,
-                    "message": f"File must be in one of {self.tree_focus[domain]['directories']}"
+                    "message": f"File size ({size} bytes) exceeds maximum allowed ({self._max_file_size} bytes)"
                 })
 
-            # Validate file size
-            if os.path.exists(file_path):
-                size = os.path.getsize(file_path)
-                if size > self.review_rules.get("max_file_size", 1000000):
-                    review_results["issues"].append({
-                        "type": "file_size",
-                        "file": file_path,
-                        "message": f"File size ({size} bytes) exceeds maximum allowed ({self.review_rules['max_file_size']} bytes)"
-                    })
-
             # Domain-specific validations
             domain_validation = await self._validate_domain_specific(file, domain)
             review_results["domain_validations"][file_path] = domain_validation
@@ -83,21 +108,22 @@ class ReviewerAgent(BaseAgent):
             # Check function length
             if "functions" in file:
                 for func in file["functions"]:
-                    if len(func.get("body", "").split("\n")) > self.review_rules.get("max_function_length", 50):
+                    # Line count without materializing the lines
+                    if func.get("body", "").count("\n") + 1 > self._max_function_length:
                         review_results["issues"].append({
                             "type": "function_length",
                             "file": file_path,
                             "function": func["name"],
-                            "message": f"Function exceeds maximum length of {self.review_rules['max_function_length']} lines"
+                            "message": f"Function exceeds maximum length of {self._max_function_length} lines"
                         })
 
         # Check test coverage if required
-        if self.review_rules.get("required_tests", True):
-            coverage = await self._check_test_coverage(code.get("files", []))
-            if coverage < self.review_rules.get("coverage_threshold", 80):
+        if self._require_tests:
+            coverage = self._check_test_coverage(file.get("path", "") for file in code.get("files", []))
+            if coverage < self._coverage_threshold:
                 review_results["issues"].append({
                     "type": "test_coverage",
-                    "message": f"Test coverage ({coverage}%) is below threshold ({self.review_rules['coverage_threshold']}%)"
+                    "message": f"Test coverage ({coverage}%) is below threshold ({self._coverage_threshold:g}%)"
                 })
 
         if review_results["issues"]:
@@ -114,26 +140,28 @@ class ReviewerAgent(BaseAgent):
         if deployment.get("error"):
             return {"status": "failed", "reason": deployment["error"]}
 
-        # Check if services are responding
-        health_checks = {}
-        
-        if "backend" in deployment["processes"]:
-            health_checks["backend"] = {
-                "status": await self._check_health(
-                    deployment["processes"]["backend"]["url"],
-                    domain="backend"
-                ),
-                "pid": deployment["processes"]["backend"]["pid"]
-            }
-        
-        if "frontend" in deployment["processes"]:
-            health_checks["frontend"] = {
-                "status": await self._check_health(
-                    deployment["processes"]["frontend"]["url"],
-                    domain="frontend"
-                ),
-                "pid": deployment["processes"]["frontend"]["pid"]
+        # Check if services are responding, all at once
+        services = [
+            service for service in ("backend", "frontend")
+            if service in deployment["processes"]
+        ]
+        timeout = self.review_rules.get("health_check_timeout", self.health_check_timeout)
+        statuses = await asyncio.gather(
+            *(asyncio.wait_for(
+                self._check_health(deployment["processes"][service]["url"], domain=service),
+                timeout
+            ) for service in services),
+            return_exceptions=True
+        )
+
+        health_checks = {
+            service: {
+                # A timed out check counts as unhealthy
+                "status": status is True,
+                "pid": deployment["processes"][service]["pid"]
             }
+            for service, status in zip(services, statuses)
+        }
 
         # Check if all required services are healthy
         unhealthy_services = {
@@ -161,29 +189,26 @@ class ReviewerAgent(BaseAgent):
     async def _check_health(self, url: str, domain: str) -> bool:
         """Check health of a service with domain-specific checks."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        return False
-                    
-                    # Domain-specific health checks
-                    if domain == "backend":
-                        data = await response.json()
-                        return data.get("status") == "healthy"
-                    elif domain == "frontend":
-                        text = await response.text()
-                        return "<title>" in text.lower()
-                    
-                    return True
+            session = await self._get_session()
+            async with session.get(url) as response:
+                if response.status != 200:
+                    return False
+
+                # Domain-specific health checks
+                if domain == "backend":
+                    data = await response.json()
+                    return data.get("status") == "healthy"
+                elif domain == "frontend":
+                    text = await response.text()
+                    return "<title>" in text.lower()
+
+                return True
         except Exception:
             return False
 
     def _get_file_domain(self, file_path: str) -> Optional[str]:
         """Get the domain for a file based on its path."""
-        for domain, rules in self.tree_focus.items():
-            if any(file_path.startswith(dir) for dir in rules["directories"]):
-                return domain
-        return None
+        return self._domain_lookup(file_path)
 
     async def _validate_domain_specific(self, file: Dict[str, Any], domain: str) -> Dict[str, Any]:
         """Validate a file against domain-specific rules."""
@@ -207,14 +232,16 @@ class ReviewerAgent(BaseAgent):
         # Check content follows domain conventions
         content = file["content"]
         if domain == "frontend":
-            if "class " in content and not "React.Component" in content:
+            hits = {m.lastgroup for m in _FRONTEND_CHECKS_RE.finditer(content)}
+            if "cls" in hits and "react" not in hits:
                 validation["suggestions"].append("Consider using functional components instead of classes")
-            if "var " in content:
+            if "var" in hits:
                 validation["suggestions"].append("Use const or let instead of var")
         elif domain == "backend":
-            if "print(" in content:
+            hits = {m.lastgroup for m in _BACKEND_CHECKS_RE.finditer(content)}
+            if "print" in hits:
                 validation["suggestions"].append("Consider using logging instead of print statements")
-            if "except:" in content:
+            if "bare_except" in hits:
                 validation["suggestions"].append("Avoid bare except clauses")
 
         if validation["issues"]:
@@ -222,11 +249,10 @@ class ReviewerAgent(BaseAgent):
 
         return validation
 
-    async def _check_test_coverage(self, files: List[str]) -> float:
-        """Calculate test coverage for a set of files."""
-        # This is a simplified implementation
-        test_files = [f for f in files if ".test." in f or "test_" in f]
-        return 100.0 if test_files else 0.0
+    def _check_test_coverage(self, files: Iterable[str]) -> float:
+        """Calculate test coverage for a set of file paths."""
+        # Order doesn't matter, so the same files in any order share one result
+        return _test_coverage(frozenset(files))
 
     async def _verify_fix(self, fix: Dict[str, Any]) -> Dict[str, Any]:
         """Verify a fix implementation."""
@@ -238,36 +264,43 @@ class ReviewerAgent(BaseAgent):
             "domain_validations": {}
         }
 
-        # Check files
-        for file_path in fix.get("files", []):
+        # Read every file concurrently in the thread pool, then check them in order
+        files = fix.get("files", [])
+        loop = asyncio.get_running_loop()
+        reads = await asyncio.gather(
+            *(loop.run_in_executor(_READ_EXECUTOR, _read_with_size, file_path) for file_path in files),
+            return_exceptions=True
+        )
+
+        for file_path, read in zip(files, reads):
             try:
-                with open(file_path, "r") as f:
-                    content = f.read()
-                    domain = self._get_file_domain(file_path)
-                    
-                    if not domain:
-                        review_results["issues"].append({
-                            "type": "domain_boundary",
-                            "file": file_path,
-                            "message": "File does not belong to any defined domain"
-                        })
-                        continue
+                if isinstance(read, Exception):
+                    raise read
+                content, size = read
+                domain = self._get_file_domain(file_path)
 
-                    # Validate file size
-                    size = os.path.getsize(file_path)
-                    if size > self.review_rules.get("max_file_size", 1000000):
-                        review_results["issues"].append({
-                            "type": "file_size",
-                            "file": file_path,
-                            "message": f"File size ({size} bytes) exceeds maximum allowed ({self.review_rules['max_file_size']} bytes)"
-                        })
+                if not domain:
+                    review_results["issues"].append({
+                        "type": "domain_boundary",
+                        "file": file_path,
+                        "message": "File does not belong to any defined domain"
+                    })
+                    continue
+
+                # Validate file size
+                if size > self._max_file_size:
+                    review_results["issues"].append({
+                        "type": "file_size",
+                        "file": file_path,
+                        "message": f"File size ({size} bytes) exceeds maximum allowed ({self._max_file_size} bytes)"
+                    })
 
-                    # Domain-specific validations
-                    domain_validation = await self._validate_domain_specific({
-                        "path": file_path,
-                        "content": content
-                    }, domain)
-                    review_results["domain_validations"][file_path] = domain_validation
+                # Domain-specific validations
+                domain_validation = await self._validate_domain_specific({
+                    "path": file_path,
+                    "content": content
+                }, domain)
+                review_results["domain_validations"][file_path] = domain_validation
 
             except Exception as e:
                 review_results["issues"].append({
@@ -277,12 +310,12 @@ class ReviewerAgent(BaseAgent):
                 })
 
         # Check test coverage if required
-        if fix.get("update_tests", False) and self.review_rules.get("required_tests", True):
-            coverage = await self._check_test_coverage(fix.get("files", []))
-            if coverage < self.review_rules.get("coverage_threshold", 80):
+        if fix.get("update_tests", False) and self._require_tests:
+            coverage = self._check_test_coverage(files)
+            if coverage < self._coverage_threshold:
                 review_results["issues"].append({
                     "type": "test_coverage",
-                    "message": f"Test coverage ({coverage}%) is below threshold ({self.review_rules['coverage_threshold']}%)"
+                    "message": f"Test coverage ({coverage}%) is below threshold ({self._coverage_threshold:g}%)"
                 })
 
         if review_results["issues"]:
@@ -1,11 +1,80 @@
-from typing import Dict, Any, List, Optional
-from .base_agent import BaseAgent
+from typing import Dict, Any, List, NamedTuple, Optional, Sequence
+from .base_agent import BaseAgent, HTML_PARSER
+import time
+import asyncio
 import aiohttp
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 import re
 import json
 
+# Pages are parsed here, off the event loop, so fetches keep flowing while a large page parses
+_PARSE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ux-html-parser")
+
+class _ParsedPage(NamedTuple):
+    soup: BeautifulSoup
+    # The page's whole text, lowercased once for topic checks
+    text: str
+
+
+def _parse_page(html: str) -> _ParsedPage:
+    soup = BeautifulSoup(html, HTML_PARSER)
+    return _ParsedPage(soup, soup.get_text().lower())
+
+
+class _CachedPage:
+    """A fetched page and, once something has parsed it, its tree and text."""
+
+    __slots__ = ("fetched_at", "html", "parsed")
+
+    def __init__(self, html: str):
+        self.fetched_at = time.monotonic()
+        self.html = html
+        self.parsed: Optional[_ParsedPage] = None
+
+
 class UXUIAgent(BaseAgent):
+    # Popular design systems
+    _DESIGN_SYSTEMS = (
+        "https://material.io/design",
+        "https://carbondesignsystem.com/",
+        "https://primer.style/",
+        "https://www.lightningdesignsystem.com/",
+        "https://atlassian.design/"
+    )
+
+    # Popular component libraries
+    _COMPONENT_LIBRARIES = (
+        "https://mui.com/components/",
+        "https://ant.design/components/",
+        "https://chakra-ui.com/docs/components",
+        "https://tailwindui.com/components"
+    )
+
+    # UX pattern resources
+    _UX_PATTERN_SOURCES = (
+        "https://www.nngroup.com/articles/",
+        "https://www.smashingmagazine.com/category/ux/",
+        "https://uxplanet.org/"
+    )
+
+    # Upper bound on third-party pages fetched at the same time
+    max_concurrent_fetches = 8
+    # Seconds a single page fetch may take before it counts as failed
+    fetch_timeout = 5.0
+    # Fetched pages kept for reuse, and for how many seconds before they are fetched again
+    page_cache_size = 32
+    page_cache_ttl = 300.0
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self._fetch_semaphore: Optional[asyncio.Semaphore] = None
+        self._fetch_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Recently fetched pages by URL, least recently used first. A page's parsed
+        # tree lives on its entry, so it is evicted, expired or replaced with the HTML
+        self._page_cache: "OrderedDict[str, _CachedPage]" = OrderedDict()
+
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process UI/UX design tasks."""
         self.log(f"Designing UI for: {input_data.get('component_name', 'Unknown Component')}")
@@ -31,56 +100,108 @@ class UXUIAgent(BaseAgent):
 
     async def _find_design_sources(self, topic: str) -> List[Dict[str, Any]]:
         """Find UI/UX design specific sources."""
-        sources = []
-        
-        # Search design systems
-        design_system_results = await self._search_design_systems(topic)
-        sources.extend(design_system_results)
+        # Search design systems, component libraries and UX patterns in one wave
+        design_system_results, component_results, pattern_results = await asyncio.gather(
+            self._search_design_systems(topic),
+            self._search_component_libraries(topic),
+            self._search_ux_patterns(topic)
+        )
+        return design_system_results + component_results + pattern_results
+
+    async def _fetch_html(self, url: str) -> Optional[str]:
+        """Fetch a page's HTML, or None if it doesn't answer with 200."""
+        page = self._cached_page(url)
+        if page is not None:
+            return page.html
+        session = await self._get_session()
+        # Like the session, the semaphore belongs to the loop it was created on
+        if self._fetch_semaphore_loop is not self._session_loop:
+            self._fetch_semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+            self._fetch_semaphore_loop = self._session_loop
+        async with self._fetch_semaphore:
+            html = await asyncio.wait_for(self._get_page(session, url), self.fetch_timeout)
+        if html is not None:
+            self._store_html(url, html)
+        return html
 
-        # Search component libraries
-        component_results = await self._search_component_libraries(topic)
-        sources.extend(component_results)
+    def _cached_page(self, url: str) -> Optional[_CachedPage]:
+        """Return the cached page for url unless it is missing or older than page_cache_ttl."""
+        page = self._page_cache.get(url)
+        if page is None:
+            return None
+        if time.monotonic() - page.fetched_at > self.page_cache_ttl:
+            del self._page_cache[url]
+            return None
+        self._page_cache.move_to_end(url)
+        return page
 
-        # Search UX patterns
-        pattern_results = await self._search_ux_patterns(topic)
-        sources.extend(pattern_results)
+    def _store_html(self, url: str, html: str) -> None:
+        self._page_cache[url] = _CachedPage(html)
+        self._page_cache.move_to_end(url)
+        while len(self._page_cache) > self.page_cache_size:
+            self._page_cache.popitem(last=False)
+
+    @staticmethod
+    async def _get_page(session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        async with session.get(url) as response:
+            if response.status == 200:
+                return await response.text()
+        return None
 
-        return sources
+    async def _get_parsed_page(self, url: str, html: str) -> _ParsedPage:
+        """Parse a fetched page, reusing the result of an earlier parse of the same HTML."""
+        page = self._page_cache.get(url)
+        if page is not None and page.html is html and page.parsed is not None:
+            return page.parsed
+        loop = asyncio.get_running_loop()
+        parsed = await loop.run_in_executor(_PARSE_EXECUTOR, _parse_page, html)
+        # Only keep the result if the entry still holds the HTML it was parsed from
+        page = self._page_cache.get(url)
+        if page is not None and page.html is html:
+            page.parsed = parsed
+        return parsed
+
+    @staticmethod
+    def _find_topic_nodes(page: _ParsedPage, names: List[str], classes: List[str], topic_lower: str) -> List[Any]:
+        """Find nodes of the given tags and classes whose text mentions the topic."""
+        # A node's text is a contiguous run of the page's text, so a page that
+        # never mentions the topic can be skipped without walking its nodes
+        if topic_lower not in page.text:
+            return []
+        return [node for node in page.soup.find_all(names, class_=classes) if topic_lower in node.get_text().lower()]
+
+    async def _fetch_all_html(self, urls: Sequence[str]) -> List[Any]:
+        """Fetch several pages concurrently; failures come back as exceptions."""
+        return await asyncio.gather(*(self._fetch_html(url) for url in urls), return_exceptions=True)
 
     async def _search_design_systems(self, topic: str) -> List[Dict[str, Any]]:
         """Search popular design systems."""
         systems = []
         
-        # Popular design systems
-        design_systems = [
-            "https://material.io/design",
-            "https://carbondesignsystem.com/",
-            "https://primer.style/",
-            "https://www.lightningdesignsystem.com/",
-            "https://atlassian.design/"
-        ]
-        
-        async with aiohttp.ClientSession() as session:
-            for system in design_systems:
-                try:
-                    async with session.get(system) as response:
-                        if response.status == 200:
-                            html = await response.text()
-                            soup = BeautifulSoup(html, 'html.parser')
-                            
-                            # Look for relevant components or patterns
-                            components = soup.find_all(['section', 'article'], class_=['component', 'pattern'])
-                            for component in components:
-                                if topic.lower() in component.text.lower():
-                                    systems.append({
-                                        "type": "design_system",
-                                        "url": system,
-                                        "name": component.find(['h1', 'h2']).text if component.find(['h1', 'h2']) else "Design Component",
-                                        "description": component.find('p').text if component.find('p') else "",
-                                        "system_name": system.split("//")[1].split(".")[0]
-                                    })
-                except Exception as e:
-                    self.log(f"Error searching design system {system}: {str(e)}")
+        topic_lower = topic.lower()
+        pages = await self._fetch_all_html(self._DESIGN_SYSTEMS)
+        for system, html in zip(self._DESIGN_SYSTEMS, pages):
+            try:
+                if isinstance(html, Exception):
+                    raise html
+                if html is None:
+                    continue
+                page = await self._get_parsed_page(system, html)
+                
+                # Look for relevant components or patterns
+                components = self._find_topic_nodes(page, ['section', 'article'], ['component', 'pattern'], topic_lower)
+                for component in components:
+                    heading = component.find(['h1', 'h2'])
+                    paragraph = component.find('p')
+                    systems.append({
+                        "type": "design_system",
+                        "url": system,
+                        "name": heading.text if heading else "Design Component",
+                        "description": paragraph.text if paragraph else "",
+                        "system_name": system.split("//")[1].split(".")[0]
+                    })
+            except Exception as e:
+                self.log(f"Error searching design system {system}: {str(e)}")
         
         return systems
 
@@ -88,35 +209,29 @@ class UXUIAgent(BaseAgent):
         """Search UI component libraries."""
         components = []
         
-        # Popular component libraries
-        libraries = [
-            "https://mui.com/components/",
-            "https://ant.design/components/",
-            "https://chakra-ui.com/docs/components",
-            "https://tailwindui.com/components"
-        ]
-        
-        async with aiohttp.ClientSession() as session:
-            for library in libraries:
-                try:
-                    async with session.get(library) as response:
-                        if response.status == 200:
-                            html = await response.text()
-                            soup = BeautifulSoup(html, 'html.parser')
-                            
-                            # Look for component documentation
-                            component_docs = soup.find_all(['div', 'article'], class_=['component', 'docs'])
-                            for doc in component_docs:
-                                if topic.lower() in doc.text.lower():
-                                    components.append({
-                                        "type": "component",
-                                        "url": library,
-                                        "name": doc.find(['h1', 'h2']).text if doc.find(['h1', 'h2']) else "UI Component",
-                                        "code": self._extract_component_code(doc),
-                                        "library": library.split("//")[1].split(".")[0]
-                                    })
-                except Exception as e:
-                    self.log(f"Error searching component library {library}: {str(e)}")
+        topic_lower = topic.lower()
+        pages = await self._fetch_all_html(self._COMPONENT_LIBRARIES)
+        for library, html in zip(self._COMPONENT_LIBRARIES, pages):
+            try:
+                if isinstance(html, Exception):
+                    raise html
+                if html is None:
+                    continue
+                page = await self._get_parsed_page(library, html)
+                
+                # Look for component documentation
+                component_docs = self._find_topic_nodes(page, ['div', 'article'], ['component', 'docs'], topic_lower)
+                for doc in component_docs:
+                    heading = doc.find(['h1', 'h2'])
+                    components.append({
+                        "type": "component",
+                        "url": library,
+                        "name": heading.text if heading else "UI Component",
+                        "code": self._extract_component_code(doc),
+                        "library": library.split("//")[1].split(".")[0]
+                    })
+            except Exception as e:
+                self.log(f"Error searching component library {library}: {str(e)}")
         
         return components
 
@@ -124,34 +239,30 @@ class UXUIAgent(BaseAgent):
         """Search UX design patterns."""
         patterns = []
         
-        # UX pattern resources
-        pattern_sources = [
-            "https://www.nngroup.com/articles/",
-            "https://www.smashingmagazine.com/category/ux/",
-            "https://uxplanet.org/"
-        ]
-        
-        async with aiohttp.ClientSession() as session:
-            for source in pattern_sources:
-                try:
-                    async with session.get(source) as response:
-                        if response.status == 200:
-                            html = await response.text()
-                            soup = BeautifulSoup(html, 'html.parser')
-                            
-                            # Look for UX pattern articles
-                            articles = soup.find_all(['article', 'div'], class_=['post', 'article'])
-                            for article in articles:
-                                if topic.lower() in article.text.lower():
-                                    patterns.append({
-                                        "type": "ux_pattern",
-                                        "url": source,
-                                        "title": article.find(['h1', 'h2']).text if article.find(['h1', 'h2']) else "UX Pattern",
-                                        "summary": article.find('p').text if article.find('p') else "",
-                                        "source": source.split("//")[1].split(".")[0]
-                                    })
-                except Exception as e:
-                    self.log(f"Error searching UX patterns from {source}: {str(e)}")
+        topic_lower = topic.lower()
+        pages = await self._fetch_all_html(self._UX_PATTERN_SOURCES)
+        for source, html in zip(self._UX_PATTERN_SOURCES, pages):
+            try:
+                if isinstance(html, Exception):
+                    raise html
+                if html is None:
+                    continue
+                page = await self._get_parsed_page(source, html)
+                
+                # Look for UX pattern articles
+                articles = self._find_topic_nodes(page, ['article', 'div'], ['post', 'article'], topic_lower)
+                for article in articles:
+                    heading = article.find(['h1', 'h2'])
+                    paragraph = article.find('p')
+                    patterns.append({
+                        "type": "ux_pattern",
+                        "url": source,
+                        "title": heading.text if heading else "UX Pattern",
+                        "summary": paragraph.text if paragraph else "",
+                        "source": source.split("//")[1].split(".")[0]
+                    })
+            except Exception as e:
+                self.log(f"Error searching UX patterns from {source}: {str(e)}")
         
         return patterns
 
@@ -196,27 +307,26 @@ class UXUIAgent(BaseAgent):
         """Extract patterns from design system documentation."""
         patterns = []
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(source["url"]) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        # Extract design guidelines
-                        guidelines = soup.find_all(['section', 'div'], class_=['guideline', 'principle'])
-                        for guideline in guidelines:
-                            title = guideline.find(['h1', 'h2', 'h3'])
-                            description = guideline.find('p')
-                            if title and description:
-                                patterns.append({
-                                    "type": "design_guideline",
-                                    "title": title.text,
-                                    "description": description.text,
-                                    "system": source["system_name"]
-                                })
-            except Exception as e:
-                self.log(f"Error extracting from design system: {str(e)}")
+        try:
+            # Usually already fetched and parsed while searching design systems
+            html = await self._fetch_html(source["url"])
+            if html is not None:
+                soup = (await self._get_parsed_page(source["url"], html)).soup
+
+                # Extract design guidelines
+                guidelines = soup.find_all(['section', 'div'], class_=['guideline', 'principle'])
+                for guideline in guidelines:
+                    title = guideline.find(['h1', 'h2', 'h3'])
+                    description = guideline.find('p')
+                    if title and description:
+                        patterns.append({
+                            "type": "design_guideline",
+                            "title": title.text,
+                            "description": description.text,
+                            "system": source["system_name"]
+                        })
+        except Exception as e:
+            self.log(f"Error extracting from design system: {str(e)}")
         
         return patterns
 
@@ -1,61 +1,64 @@
 import asyncio
+from types import MappingProxyType
 from multiagentframework import OrchestratorAgent
 
-async def main():
-    # Initialize the orchestrator with your config
-    config = {
-        "tree_focus": {
-            "frontend": {
-                "directories": ["src/", "components/"],
-                "extensions": [".tsx", ".ts", ".css"],
-                "naming_conventions": {
-                    "components": "PascalCase",
-                    "files": "kebab-case"
-                }
+# Framework config, built once at import. The agents only read it, so it is
+# shared as a read-only view and handed to them without any YAML parsing.
+CONFIG = MappingProxyType({
+    "tree_focus": {
+        "frontend": {
+            "directories": ["src/", "components/"],
+            "extensions": [".tsx", ".ts", ".css"],
+            "naming_conventions": {
+                "components": "PascalCase",
+                "files": "kebab-case"
             }
-        },
-        "workflows": {
-            "create_feature": {
-                "steps": [
-                    {
-                        "type": "create_component",
-                        "agent": "developer",
-                        "params": {
-                            "domain": "frontend"
-                        },
-                        "require_review": True
+        }
+    },
+    "workflows": {
+        "create_feature": {
+            "steps": [
+                {
+                    "type": "create_component",
+                    "agent": "developer",
+                    "params": {
+                        "domain": "frontend"
                     },
-                    {
-                        "type": "review_code",
-                        "agent": "reviewer",
-                        "review_type": "domain_validation"
-                    }
-                ]
-            }
-        },
-        "agents": {
-            "developer": {
-                "allowed_actions": ["create_component"],
-                "domain_rules": {
-                    "frontend": {
-                        "require_tests": True,
-                        "max_file_size": 1000000,
-                        "max_function_length": 50
-                    }
+                    "require_review": True
+                },
+                {
+                    "type": "review_code",
+                    "agent": "reviewer",
+                    "review_type": "domain_validation"
                 }
-            },
-            "reviewer": {
-                "allowed_actions": ["review_code"],
-                "review_rules": {
-                    "coverage_threshold": 80,
+            ]
+        }
+    },
+    "agents": {
+        "developer": {
+            "allowed_actions": ["create_component"],
+            "domain_rules": {
+                "frontend": {
+                    "require_tests": True,
                     "max_file_size": 1000000,
                     "max_function_length": 50
                 }
             }
+        },
+        "reviewer": {
+            "allowed_actions": ["review_code"],
+            "review_rules": {
+                "coverage_threshold": 80,
+                "max_file_size": 1000000,
+                "max_function_length": 50
+            }
         }
     }
-    
-    orchestrator = OrchestratorAgent(config)
+})
+
+async def main():
+    # Initialize the orchestrator with the config
+    orchestrator = OrchestratorAgent(CONFIG)
 
     # Create a new component
     result = await orchestrator.process({
@@ -1,93 +1,296 @@
-import yaml
+import os
+import sys
+import json
+import queue
 import asyncio
-from typing import Dict, Any, Type, List
+import aiohttp
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from collections import ChainMap
+from typing import Dict, Any, Awaitable, Callable, List, Mapping, Optional, Tuple, Type
+import importlib
 from pathlib import Path
 
-from agents.architect import ArchitectAgent
-from agents.developer import DeveloperAgent
-from agents.reviewer import ReviewerAgent
-from agents.ux_ui import UXUIAgent
 from agents.base_agent import BaseAgent
+from agents._config_cache import load_config
+
+logger = logging.getLogger(__name__)
+
+# Task results are written out as JSON, through orjson when it is installed
+try:
+    import orjson
+
+    def _dump_json(data: Any) -> bytes:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dump_json(data: Any) -> bytes:
+        return json.dumps(data, default=str, separators=(",", ":")).encode()
+
+# Module and class for each name under the config's agents section; a module
+# is only imported once an enabled agent needs it
+_AGENT_SPECS: Dict[str, Tuple[str, str]] = {
+    "architect": ("agents.architect", "ArchitectAgent"),
+    "developer": ("agents.developer", "DeveloperAgent"),
+    "reviewer": ("agents.reviewer", "ReviewerAgent"),
+    "ux_ui": ("agents.ux_ui", "UXUIAgent")
+}
+
+
+def _agent_class(agent_name: str) -> Optional[Type[BaseAgent]]:
+    spec = _AGENT_SPECS.get(agent_name)
+    if spec is None:
+        return None
+    module_name, class_name = spec
+    return getattr(importlib.import_module(module_name), class_name)
+
+# Agents whose phase has to wait for their own learning when a task requires it.
+# The architect doesn't consult learned knowledge, so it starts right away.
+# A config can override this with a top-level depends_on_learning list.
+_DEPENDS_ON_LEARNING = ("developer", "reviewer", "ux_ui")
+
+# The root handler installed by configure_logging, replaced rather than stacked on repeat calls
+_log_handler: Optional[QueueHandler] = None
+
 
 class Orchestrator:
-    def __init__(self, config_path: str = "config/config.yaml"):
-        self.config = self._load_config(config_path)
+    # Fixed attribute set, so instances skip the per-instance __dict__;
+    # subclasses need their own __slots__ to keep that saving
+    __slots__ = ("config", "agents", "_http", "_http_loop", "_max_concurrent_learn", "_learn_semaphore",
+                 "_learn_inflight")
+
+    def __init__(self, config_path: str = "config/config.yaml", config: Optional[Dict[str, Any]] = None):
+        # An already loaded config skips the file entirely
+        self.config = config if config is not None else self._load_config(config_path)
         self.agents = self._initialize_agents()
-        
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
+        # One pooled HTTP session shared by every agent, opened on first use
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Caps how many agents learn at once so they don't all hit the same APIs together
+        self._max_concurrent_learn = self.config.get("max_concurrent_learn", 4)
+        self._learn_semaphore: Optional[asyncio.Semaphore] = None
+        # Learning currently running per (agent, topic); concurrent tasks on the same topic join it
+        self._learn_inflight: Dict[Tuple[str, str], "asyncio.Future[Dict[str, Any]]"] = {}
+
+    def _load_config(self, config_path: str) -> Mapping[str, Any]:
         """Load configuration from YAML file."""
         config_file = Path(config_path)
         if not config_file.exists():
             raise FileNotFoundError(f"Config file not found: {config_path}")
             
-        with open(config_file, 'r') as f:
-            return yaml.safe_load(f)
+        # Parsed once per process, and shared with the agents loading the same
+        # file, until its mtime or size changes; the result is read-only
+        return load_config(str(config_file))
     
     def _initialize_agents(self) -> Dict[str, BaseAgent]:
         """Initialize all agents based on configuration."""
-        agent_classes: Dict[str, Type[BaseAgent]] = {
-            "architect": ArchitectAgent,
-            "developer": DeveloperAgent,
-            "reviewer": ReviewerAgent,
-            "ux_ui": UXUIAgent
-        }
-        
         agents = {}
         for agent_name, agent_config in self.config.get("agents", {}).items():
             if agent_config.get("enabled", True):
-                agent_class = agent_classes.get(agent_name)
+                agent_class = _agent_class(agent_name)
                 if agent_class:
-                    agents[agent_name] = agent_class(agent_config)
+                    # Agents that need the whole config get the one already loaded here
+                    agents[agent_name] = agent_class(self.config if agent_class.needs_full_config else agent_config)
         
         return agents
     
+    async def _ensure_http(self) -> aiohttp.ClientSession:
+        """Open the shared HTTP session if needed and hand it to every agent."""
+        loop = asyncio.get_running_loop()
+        # Like the agents' own sessions, this one belongs to the loop it was opened on
+        if self._http is None or self._http.closed or self._http_loop is not loop:
+            stale = self._http
+            http = self._http = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=60),
+                connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300)
+            )
+            self._http_loop = loop
+            # Semaphores are also tied to a loop, so it is created alongside the session
+            self._learn_semaphore = asyncio.Semaphore(self._max_concurrent_learn)
+            await asyncio.gather(*(agent.attach_session(http) for agent in self.agents.values()))
+            # Close one left over from an earlier loop only once no agent holds it any more
+            if stale is not None and not stale.closed:
+                await stale.close()
+            return http
+        return self._http
+
+    async def warmup(self) -> None:
+        """Warm every agent up so the first task doesn't pay their setup cost.
+
+        Set ORCH_WARMUP=0 in the environment to skip it.
+        """
+        if os.environ.get("ORCH_WARMUP", "1") == "0":
+            return
+        await self._ensure_http()
+        await asyncio.gather(*(agent.warmup() for agent in self.agents.values()))
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session and flush every agent's knowledge base."""
+        await asyncio.gather(*(agent.aclose() for agent in self.agents.values()))
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+        self._http_loop = None
+
+    async def _learn(self, agent_name: str, agent: BaseAgent, topic: str) -> Dict[str, Any]:
+        key = (agent_name, topic)
+        inflight = self._learn_inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._run_learn(agent_name, agent, topic))
+            self._learn_inflight[key] = inflight
+
+            def finished(future: "asyncio.Future[Dict[str, Any]]") -> None:
+                self._learn_inflight.pop(key, None)
+                # Retrieve the error so a run nobody waits on any more isn't reported as unhandled
+                if not future.cancelled():
+                    future.exception()
+
+            inflight.add_done_callback(finished)
+        # One caller giving up must not cancel the run other callers are waiting on
+        return await asyncio.shield(inflight)
+
+    async def _run_learn(self, agent_name: str, agent: BaseAgent, topic: str) -> Dict[str, Any]:
+        async with self._learn_semaphore:
+            self.log(f"Agent {agent_name} is learning about: {topic}")
+            return await agent.learn(topic)
+
+    def _start_learning(self, topic: str) -> Dict[str, "asyncio.Future[Dict[str, Any]]"]:
+        # Learning is independent per agent, so agents learn concurrently up to the cap
+        return {
+            name: asyncio.ensure_future(self._learn(name, agent, topic))
+            for name, agent in self.agents.items()
+        }
+
     async def learn_task(self, topic: str) -> Dict[str, Any]:
         """Coordinate learning across all agents for a specific topic."""
-        learning_results = {}
-        
-        # Each agent learns about the topic
-        for agent_name, agent in self.agents.items():
-            self.log(f"Agent {agent_name} is learning about: {topic}")
-            learning_results[agent_name] = await agent.learn(topic)
-        
-        return learning_results
-    
+        await self._ensure_http()
+        tasks = self._start_learning(topic)
+        results = await asyncio.gather(*tasks.values())
+
+        return dict(zip(tasks, results))
+
     async def process_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a task through the agent pipeline."""
+        """Process a task through the agent pipeline.
+
+        Each phase sees the task layered under the output it builds on, as a
+        ChainMap rather than a merged copy, so agents must treat their input
+        as read-only.
+        """
         results = {}
-        
-        # First, let agents learn about the task if needed
+        await self._ensure_http()
+
+        # Learning runs in the background; a phase that needs it waits only for
+        # its own agent's learning, not for every agent's
+        learning: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
         if task_data.get("requires_learning"):
-            learning_results = await self.learn_task(task_data["topic"])
-            results["learning"] = learning_results
-        
-        # Architecture phase
-        if "architect" in self.agents:
-            results["architecture"] = await self.agents["architect"].process(task_data)
-        
+            learning = self._start_learning(task_data["topic"])
+        gated = frozenset(self.config.get("depends_on_learning", _DEPENDS_ON_LEARNING))
+
+        async def learned(agent_name: str) -> None:
+            if agent_name in gated and agent_name in learning:
+                await learning[agent_name]
+
+        phases = {}
+        try:
+            # Architecture phase
+            architect = self.agents.get("architect")
+            if architect is not None:
+                await learned("architect")
+                phases["architecture"] = await architect.process(task_data)
+            architecture = phases.get("architecture", {})
+
+            # Development + review and UX/UI only need the architecture, so they run side by side
+            build_results, ui_results = await asyncio.gather(
+                self._develop_and_review(task_data, architecture, learned),
+                self._design_ui(task_data, architecture, learned)
+            )
+            phases.update(build_results)
+            phases.update(ui_results)
+
+            if learning:
+                results["learning"] = dict(zip(learning, await asyncio.gather(*learning.values())))
+        except BaseException:
+            for task in learning.values():
+                task.cancel()
+            raise
+
+        results.update(phases)
+        return results
+
+    async def _develop_and_review(self, task_data: Dict[str, Any], architecture: Dict[str, Any],
+                                  learned: Callable[[str], Awaitable[None]]) -> Dict[str, Any]:
+        """Run the development phase and then review what it produced."""
+        results = {}
+
         # Development phase
-        if "developer" in self.agents:
-            dev_input = {**task_data, **results.get("architecture", {})}
-            results["development"] = await self.agents["developer"].process(dev_input)
-        
+        developer = self.agents.get("developer")
+        if developer is not None:
+            await learned("developer")
+            dev_input = ChainMap(architecture, task_data)
+            results["development"] = await developer.process(dev_input)
+
         # Review phase
-        if "reviewer" in self.agents:
-            review_input = {**task_data, **results.get("development", {})}
-            results["review"] = await self.agents["reviewer"].process(review_input)
-        
+        reviewer = self.agents.get("reviewer")
+        if reviewer is not None:
+            await learned("reviewer")
+            review_input = ChainMap(results.get("development", {}), task_data)
+            results["review"] = await reviewer.process(review_input)
+
+        return results
+
+    async def _design_ui(self, task_data: Dict[str, Any], architecture: Dict[str, Any],
+                         learned: Callable[[str], Awaitable[None]]) -> Dict[str, Any]:
+        """Run the UX/UI phase."""
+        results = {}
+
         # UX/UI phase
-        if "ux_ui" in self.agents:
-            ui_input = {**task_data, **results.get("architecture", {})}
-            results["ux_ui"] = await self.agents["ux_ui"].process(ui_input)
-        
+        ux_ui = self.agents.get("ux_ui")
+        if ux_ui is not None:
+            await learned("ux_ui")
+            ui_input = ChainMap(architecture, task_data)
+            results["ux_ui"] = await ux_ui.process(ui_input)
+
         return results
 
     def log(self, message: str) -> None:
         """Log orchestrator activity."""
-        print(f"[Orchestrator] {message}")
+        logger.info("[Orchestrator] %s", message)
+
+
+def configure_logging(level: int = logging.INFO) -> QueueListener:
+    """Print framework logs to stdout from a background thread.
+
+    Logging calls on the event loop only enqueue the record; the returned
+    listener does the writing and must be stopped before exiting. Calling it
+    again replaces the handler installed before, so records are never written
+    twice; the earlier listener is left for its caller to stop.
+    """
+    global _log_handler
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+
+    root = logging.getLogger()
+    if _log_handler is not None:
+        root.removeHandler(_log_handler)
+    _log_handler = QueueHandler(log_queue)
+    root.addHandler(_log_handler)
+    root.setLevel(level)
+    listener.start()
+    return listener
 
 async def main():
+    listener = configure_logging()
+    # ORCH_PROFILE=1 profiles construction through task processing into
+    # orchestrator.prof, for pstats, snakeviz or similar viewers
+    profiler = None
+    if os.environ.get("ORCH_PROFILE") == "1":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
     orchestrator = Orchestrator()
+    await orchestrator.warmup()
     
     # Example task with learning requirement
     task = {
@@ -100,8 +303,18 @@ async def main():
         }
     }
     
-    results = await orchestrator.process_task(task)
-    print("Task processing completed:", results)
+    try:
+        results = await orchestrator.process_task(task)
+        # One encode and one write rather than repr-ing the whole result tree
+        sys.stdout.flush()
+        sys.stdout.buffer.write(b"Task processing completed: " + _dump_json(results) + b"\n")
+        sys.stdout.buffer.flush()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats("orchestrator.prof")
+        await orchestrator.aclose()
+        listener.stop()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -5,11 +5,19 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=[
+        # Configs load through libyaml's CSafeLoader when PyYAML was built
+        # against libyaml (install libyaml-dev first when building from source)
         "pyyaml>=6.0",
         "aiohttp>=3.8.0",
         "pytest>=7.0.0",
-        "pytest-asyncio>=0.20.0"
+        "pytest-asyncio>=0.24.0"
     ],
+    extras_require={
+        # C-backed HTML parser picked up automatically by the scraping agents
+        "lxml": ["lxml>=4.9"],
+        # Faster JSON encoding for printed task results
+        "orjson": ["orjson>=3.6"]
+    },
     author="Your Name",
     author_email="your.email@example.com",
     description="A multi-agent framework for code generation and review",
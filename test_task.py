@@ -1,10 +1,12 @@
 import asyncio
-from orchestrator import Orchestrator
+from orchestrator import Orchestrator, configure_logging
 
 async def run_test_task():
     """Run a test task through the multi-agent framework."""
     # Initialize orchestrator
+    listener = configure_logging()
     orchestrator = Orchestrator()
+    await orchestrator.warmup()
     
     # Define a deployment task
     task = {
@@ -34,6 +36,9 @@ async def run_test_task():
             
     except Exception as e:
         print(f"Error processing task: {str(e)}")
+    finally:
+        await orchestrator.aclose()
+        listener.stop()
 
 if __name__ == "__main__":
     print("Starting test task...")
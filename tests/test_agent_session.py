@@ -0,0 +1,75 @@
+import os
+import asyncio
+import aiohttp
+import unittest
+import tempfile
+from agents.reviewer import ReviewerAgent
+
+class TestAgentSession(unittest.TestCase):
+    def setUp(self):
+        """Set up an agent whose knowledge store lives in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        self.agent = ReviewerAgent({})
+
+    def tearDown(self):
+        """Restore the working directory and clean up."""
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def test_session_from_previous_loop_closed(self):
+        """Test that moving to a new event loop closes the session owned on the old one."""
+        first = asyncio.run(self.agent._get_session())
+        second = asyncio.run(self.agent._get_session())
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        asyncio.run(self.agent.aclose())
+        self.assertTrue(second.closed)
+
+    def test_concurrent_callers_share_new_session(self):
+        """Test that callers racing on a new loop all get the one session that replaces the old."""
+        first = asyncio.run(self.agent._get_session())
+
+        async def race():
+            return await asyncio.gather(*(self.agent._get_session() for _ in range(5)))
+
+        sessions = asyncio.run(race())
+        self.assertTrue(first.closed)
+        self.assertEqual(len({id(session) for session in sessions}), 1)
+        self.assertIs(sessions[0], self.agent._session)
+        asyncio.run(self.agent.aclose())
+
+    def test_borrowed_session_left_open(self):
+        """Test that a session borrowed from another owner is never closed by the agent."""
+        async def borrow():
+            session = aiohttp.ClientSession()
+            await self.agent.attach_session(session)
+            return session
+
+        async def replace():
+            return await self.agent._get_session()
+
+        borrowed = asyncio.run(borrow())
+        own = asyncio.run(replace())
+        self.assertFalse(borrowed.closed)
+        asyncio.run(borrowed.close())
+        asyncio.run(self.agent.aclose())
+        self.assertTrue(own.closed)
+
+    def test_attach_closes_owned_session(self):
+        """Test that borrowing a session closes the one the agent opened itself."""
+        async def attach():
+            own = await self.agent._get_session()
+            borrowed = aiohttp.ClientSession()
+            await self.agent.attach_session(borrowed)
+            self.assertTrue(own.closed)
+            self.assertIs(await self.agent._get_session(), borrowed)
+            await self.agent.aclose()
+            self.assertFalse(borrowed.closed)
+            await borrowed.close()
+
+        asyncio.run(attach())
+
+if __name__ == "__main__":
+    unittest.main()
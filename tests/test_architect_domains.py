@@ -0,0 +1,49 @@
+import os
+import unittest
+import tempfile
+from agents.architect import ArchitectAgent
+
+class TestArchitectDomains(unittest.TestCase):
+    def setUp(self):
+        """Set up an architect whose knowledge store lives in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        self.agent = ArchitectAgent({"tree_focus": {
+            "frontend": {"directories": ["src/"], "extensions": [".tsx", ".test.ts"]},
+            "devops": {"directories": ["deploy/"], "extensions": ["Dockerfile", ".yml"]}
+        }})
+
+    def tearDown(self):
+        """Restore the working directory and clean up."""
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def test_domains_agree_with_is_within_domain(self):
+        """Test that path lookup and is_within_domain agree, including dotless extensions."""
+        cases = {
+            "src/App.tsx": ["frontend"],
+            "src/app.test.ts": ["frontend"],
+            "src/app.ts": [],
+            "deploy/Dockerfile": ["devops"],
+            "deploy/compose.yml": ["devops"],
+            "src/Dockerfile": []
+        }
+        for path, domains in cases.items():
+            self.assertEqual(self.agent._domains_for_path(path), domains, path)
+            for domain in ("frontend", "devops"):
+                self.assertEqual(self.agent.is_within_domain(path, domain), domain in domains, path)
+
+    def test_directories_match_whole_segments(self):
+        """Test that a directory rule only covers files under that exact directory."""
+        agent = ArchitectAgent({"tree_focus": {
+            "frontend": {"directories": ["src/f"], "extensions": [".tsx"]}
+        }})
+        self.assertEqual(agent._domains_for_path("src/f/App.tsx"), ["frontend"])
+        self.assertEqual(agent._domains_for_path("src/foo/App.tsx"), [])
+        self.assertFalse(agent.is_within_domain("src/foo/App.tsx", "frontend"))
+        self.assertEqual(agent._dir_domains("src/"), {"frontend"})
+        self.assertEqual(agent._dir_domains("src/foo/"), set())
+
+if __name__ == "__main__":
+    unittest.main()
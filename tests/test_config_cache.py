@@ -0,0 +1,41 @@
+import json
+import unittest
+import tempfile
+from pathlib import Path
+from agents import _config_cache
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary config file."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config_path = Path(self.tmp_dir.name) / "config.yaml"
+        self.config_path.write_text("agents:\n  developer:\n    enabled: true\n")
+        self.sidecar_path = Path(str(self.config_path) + ".json")
+
+    def tearDown(self):
+        """Clean up the config file."""
+        self.tmp_dir.cleanup()
+
+    def test_sidecar_written_and_reused(self):
+        """Test that a current JSON sidecar is used in place of the YAML."""
+        config = _config_cache._parse_yaml_with_sidecar(str(self.config_path))
+        self.assertEqual(config, {"agents": {"developer": {"enabled": True}}})
+        self.assertTrue(self.sidecar_path.exists())
+        # The temp file the sidecar was written through is gone
+        self.assertEqual(sorted(p.name for p in self.config_path.parent.iterdir()),
+                         ["config.yaml", "config.yaml.json"])
+
+        sidecar = json.loads(self.sidecar_path.read_text())
+        sidecar["config"] = {"from": "sidecar"}
+        self.sidecar_path.write_text(json.dumps(sidecar))
+        self.assertEqual(_config_cache._parse_yaml_with_sidecar(str(self.config_path)), {"from": "sidecar"})
+
+    def test_stale_sidecar_ignored(self):
+        """Test that editing the YAML invalidates the sidecar."""
+        _config_cache._parse_yaml_with_sidecar(str(self.config_path))
+        self.config_path.write_text("agents: {}\n")
+
+        self.assertEqual(_config_cache._parse_yaml_with_sidecar(str(self.config_path)), {"agents": {}})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from agents._dir_trie import DirTrie, shared_dir_trie
+
+class TestDirTrie(unittest.TestCase):
+    def setUp(self):
+        """Set up a trie over overlapping domain directories."""
+        self.trie = DirTrie({
+            "frontend": {"directories": ["src/", "components/"]},
+            "shared": {"directories": ["src/lib"]},
+            "backend": {"directories": ["api/", "server/v1/"]}
+        })
+
+    def test_matches_whole_segments(self):
+        """Test that directories only match whole leading path segments."""
+        expected = {
+            "src/App.tsx": {"frontend"},
+            "src/lib/util.ts": {"frontend", "shared"},
+            "src/library/x.ts": {"frontend"},
+            "./src/App.tsx": {"frontend"},
+            "src": set(),
+            "api/routes.py": {"backend"},
+            "server/v1/app.py": {"backend"},
+            "server/v2/app.py": set(),
+            "srcx/a.ts": set()
+        }
+        for path, domains in expected.items():
+            self.assertEqual(self.trie.domains_for(path), domains, path)
+
+    def test_first_domain_uses_config_order(self):
+        """Test that overlapping matches resolve to the first configured domain."""
+        self.assertEqual(self.trie.first_domain("src/lib/util.ts"), "frontend")
+        self.assertIsNone(self.trie.first_domain("docs/readme.md"))
+        self.assertTrue(self.trie.contains_prefix("server/v1/app.py", "backend"))
+        self.assertFalse(self.trie.contains_prefix("server/v2/app.py", "backend"))
+
+    def test_domains_under_directory(self):
+        """Test that a directory reports domains configured above, at or below it."""
+        self.assertEqual(self.trie.domains_under("src/"), {"frontend", "shared"})
+        self.assertEqual(self.trie.domains_under("src/lib/x/"), {"frontend", "shared"})
+        self.assertEqual(self.trie.domains_under("src/app/"), {"frontend"})
+        self.assertEqual(self.trie.domains_under("server/"), {"backend"})
+        self.assertEqual(self.trie.domains_under("srcx/"), set())
+
+    def test_shared_trie_per_directory_layout(self):
+        """Test that agents with the same directories share one trie."""
+        tree_focus = {"frontend": {"directories": ["src/"], "extensions": [".tsx"]}}
+        same_dirs = {"frontend": {"directories": ["src/"]}}
+        other_dirs = {"frontend": {"directories": ["app/"]}}
+        self.assertIs(shared_dir_trie(tree_focus), shared_dir_trie(same_dirs))
+        self.assertIsNot(shared_dir_trie(tree_focus), shared_dir_trie(other_dirs))
+        self.assertEqual(shared_dir_trie(tree_focus).first_domain("src/App.tsx"), "frontend")
+
+if __name__ == "__main__":
+    unittest.main()
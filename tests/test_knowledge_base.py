@@ -0,0 +1,78 @@
+import json
+import unittest
+import tempfile
+from pathlib import Path
+from agents.base_agent import KnowledgeBase
+
+class TestKnowledgeBase(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary knowledge store."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.storage_dir = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        """Clean up the knowledge store."""
+        self.tmp_dir.cleanup()
+
+    def test_journal_replay(self):
+        """Test that journaled additions survive a reload without a snapshot rewrite."""
+        kb = KnowledgeBase(self.storage_dir)
+        knowledge_id = kb.add_knowledge(
+            "state management",
+            {"references": [{"url": "https://example.com"}], "key_points": ["use context"]},
+            tags=["frontend"]
+        )
+
+        self.assertFalse(kb.index_file.exists())
+        self.assertTrue(kb.journal_file.exists())
+
+        reloaded = KnowledgeBase(self.storage_dir)
+        self.assertEqual(reloaded.index["topics"]["state management"], [knowledge_id])
+        self.assertEqual(reloaded.index["tags"]["frontend"], [knowledge_id])
+        self.assertEqual(reloaded.index["references"]["https://example.com"], [knowledge_id])
+
+    def test_compaction(self):
+        """Test that closing folds the journal into the index snapshot."""
+        kb = KnowledgeBase(self.storage_dir)
+        kb.add_knowledge("routing", {"key_points": ["file-based"]})
+        kb.add_knowledge("routing", {"key_points": ["file-based"]})
+        kb.close()
+
+        self.assertTrue(kb.index_file.exists())
+        self.assertFalse(kb.journal_file.exists())
+
+        reloaded = KnowledgeBase(self.storage_dir)
+        summary = reloaded.summarize_knowledge("routing")
+        self.assertEqual(len(reloaded.index["topics"]["routing"]), 2)
+        self.assertEqual(summary["total_entries"], 2)
+        self.assertEqual(summary["key_points"], ["file-based"])
+
+    def test_rebuilt_summaries_persisted(self):
+        """Test that summaries rebuilt for an older index are written back on load."""
+        kb = KnowledgeBase(self.storage_dir)
+        kb.add_knowledge("routing", {"key_points": ["file-based"]})
+        kb.close()
+        index = json.loads(kb.index_file.read_text())
+        del index["summaries"]
+        kb.index_file.write_text(json.dumps(index))
+
+        reloaded = KnowledgeBase(self.storage_dir)
+        self.assertEqual(reloaded.summarize_knowledge("routing")["total_entries"], 1)
+        self.assertIn("routing", json.loads(kb.index_file.read_text())["summaries"])
+
+    def test_replay_skips_entries_in_snapshot(self):
+        """Test that journal records already folded into the snapshot are not indexed twice."""
+        kb = KnowledgeBase(self.storage_dir)
+        knowledge_id = kb.add_knowledge("routing", {"key_points": ["file-based"]}, tags=["frontend"])
+        journal = kb.journal_file.read_text()
+        kb.close()
+        kb.journal_file.write_text(journal + journal)
+
+        reloaded = KnowledgeBase(self.storage_dir)
+        self.assertEqual(reloaded.index["topics"]["routing"], [knowledge_id])
+        self.assertEqual(reloaded.index["tags"]["frontend"], [knowledge_id])
+        self.assertEqual(reloaded.summarize_knowledge("routing")["total_entries"], 1)
+        reloaded.close()
+
+if __name__ == "__main__":
+    unittest.main()
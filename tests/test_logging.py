@@ -0,0 +1,32 @@
+import logging
+import unittest
+from logging.handlers import QueueHandler
+from orchestrator import configure_logging
+
+class TestConfigureLogging(unittest.TestCase):
+    def setUp(self):
+        """Remember the root logger's handlers and level."""
+        self.root = logging.getLogger()
+        self.handlers = list(self.root.handlers)
+        self.level = self.root.level
+
+    def tearDown(self):
+        """Put the root logger back as it was."""
+        self.root.handlers[:] = self.handlers
+        self.root.setLevel(self.level)
+
+    def test_repeat_calls_install_one_handler(self):
+        """Test that configuring logging twice leaves a single queue handler on the root logger."""
+        first = configure_logging()
+        second = configure_logging(logging.DEBUG)
+        try:
+            queue_handlers = [h for h in self.root.handlers if isinstance(h, QueueHandler)]
+            self.assertEqual(len(queue_handlers), 1)
+            self.assertIs(queue_handlers[0].queue, second.queue)
+            self.assertEqual(self.root.level, logging.DEBUG)
+        finally:
+            first.stop()
+            second.stop()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,13 @@
-import unittest
-import asyncio
-import yaml
-from pathlib import Path
+import pytest
 from agents.orchestrator import OrchestratorAgent
 
-class TestOrchestratorAgent(unittest.TestCase):
-    def setUp(self):
-        """Set up test environment."""
-        self.test_config = {
+# Every test in the class runs on one shared event loop
+@pytest.mark.asyncio(loop_scope="class")
+class TestOrchestratorAgent:
+    @classmethod
+    def setup_class(cls):
+        """Build the shared test config once; tests only read it."""
+        cls.test_config = {
             "tree_focus": {
                 "frontend": {
                     "directories": ["src/", "components/"],
@@ -81,23 +81,12 @@ class TestOrchestratorAgent(unittest.TestCase):
                 }
             }
         }
-        
-        # Save test config
-        Path("config").mkdir(exist_ok=True)
-        with open("config/config.yaml", "w") as f:
-            yaml.dump(self.test_config, f)
-        
-        self.orchestrator = OrchestratorAgent(self.test_config)
 
-    def tearDown(self):
-        """Clean up test environment."""
-        try:
-            Path("config/config.yaml").unlink()
-            Path("config").rmdir()
-        except:
-            pass
+    def setup_method(self):
+        """Set up test environment."""
+        self.orchestrator = OrchestratorAgent(self.test_config)
 
-    async def async_test_workflow_execution(self):
+    async def test_workflow_execution(self):
         """Test workflow execution."""
         # Test create_feature workflow
         feature_result = await self.orchestrator.process({
@@ -115,8 +104,8 @@ class TestOrchestratorAgent(unittest.TestCase):
             }
         })
         
-        self.assertEqual(feature_result["status"], "completed")
-        self.assertTrue(len(feature_result["results"]) > 0)
+        assert feature_result["status"] == "completed"
+        assert len(feature_result["results"]) > 0
         
         # Test fix_issue workflow
         issue_result = await self.orchestrator.process({
@@ -133,14 +122,10 @@ class TestOrchestratorAgent(unittest.TestCase):
             }
         })
         
-        self.assertEqual(issue_result["status"], "completed")
-        self.assertTrue(len(issue_result["results"]) > 0)
+        assert issue_result["status"] == "completed"
+        assert len(issue_result["results"]) > 0
 
-    def test_workflow_execution(self):
-        """Wrapper for async workflow test."""
-        asyncio.run(self.async_test_workflow_execution())
-
-    async def async_test_review_gates(self):
+    async def test_review_gates(self):
         """Test review gates in workflows."""
         result = await self.orchestrator.process({
             "workflow": "create_feature",
@@ -157,14 +142,10 @@ class TestOrchestratorAgent(unittest.TestCase):
             }
         })
         
-        self.assertEqual(result["status"], "review_failed")
-        self.assertIn("review_feedback", result)
-
-    def test_review_gates(self):
-        """Wrapper for async review gates test."""
-        asyncio.run(self.async_test_review_gates())
+        assert result["status"] == "review_failed"
+        assert "review_feedback" in result
 
-    async def async_test_domain_validation(self):
+    async def test_domain_validation(self):
         """Test domain validation."""
         result = await self.orchestrator.process({
             "workflow": "create_feature",
@@ -181,22 +162,38 @@ class TestOrchestratorAgent(unittest.TestCase):
             }
         })
         
-        self.assertEqual(result["status"], "review_failed")
-        self.assertTrue(any("naming convention" in str(feedback).lower() 
-                          for feedback in result["review_feedback"]))
+        assert result["status"] == "review_failed"
+        assert any("naming convention" in str(feedback).lower()
+                   for feedback in result["review_feedback"])
 
-    def test_domain_validation(self):
-        """Wrapper for async domain validation test."""
-        asyncio.run(self.async_test_domain_validation())
+    async def test_state_extraction_error_fails_step(self):
+        """Test that an error extracting a step's state updates becomes the step's error result."""
+        class Developer:
+            async def process(self, input_data):
+                return {"status": "success", "files": []}
 
-    def test_config_loading(self):
+        def broken(step, result):
+            raise ValueError("bad result")
+
+        self.orchestrator._agents["developer"] = Developer()
+        self.orchestrator._extract_state_updates = broken
+        result = await self.orchestrator.process({
+            "workflow": "create_feature",
+            "component": {"name": "TestComponent", "domain": "frontend", "files": []}
+        })
+
+        assert result["status"] == "error"
+        assert result["details"] == "bad result"
+        assert len(result["partial_results"]) == 1
+
+    async def test_config_loading(self):
         """Test configuration loading."""
-        self.assertIsNotNone(self.orchestrator.config)
-        self.assertIn("workflows", self.orchestrator.config)
-        self.assertIn("tree_focus", self.orchestrator.config)
-        self.assertIn("agents", self.orchestrator.config)
+        assert self.orchestrator.config is not None
+        assert "workflows" in self.orchestrator.config
+        assert "tree_focus" in self.orchestrator.config
+        assert "agents" in self.orchestrator.config
 
-    def test_workflow_validation(self):
+    async def test_workflow_validation(self):
         """Test workflow validation."""
         invalid_workflow = {
             "workflow": "non_existent_workflow",
@@ -206,8 +203,5 @@ class TestOrchestratorAgent(unittest.TestCase):
             }
         }
         
-        with self.assertRaises(Exception):
-            asyncio.run(self.orchestrator.process(invalid_workflow))
-
-if __name__ == "__main__":
-    unittest.main() 
\ No newline at end of file
+        with pytest.raises(Exception):
+            await self.orchestrator.process(invalid_workflow) 
\ No newline at end of file
@@ -0,0 +1,55 @@
+import os
+import asyncio
+import unittest
+import tempfile
+from agents.ux_ui import UXUIAgent
+
+class TestUXPageCache(unittest.TestCase):
+    def setUp(self):
+        """Set up an agent whose knowledge store lives in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        self.agent = UXUIAgent({})
+        self.agent.page_cache_size = 2
+
+    def tearDown(self):
+        """Restore the working directory and clean up."""
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def test_least_recently_used_page_evicted(self):
+        """Test that the cache keeps only the most recently used pages."""
+        self.agent._store_html("https://a.example", "<p>a</p>")
+        self.agent._store_html("https://b.example", "<p>b</p>")
+        self.assertEqual(self.agent._cached_page("https://a.example").html, "<p>a</p>")
+        self.agent._store_html("https://c.example", "<p>c</p>")
+
+        self.assertIsNone(self.agent._cached_page("https://b.example"))
+        self.assertEqual(self.agent._cached_page("https://a.example").html, "<p>a</p>")
+        self.assertEqual(self.agent._cached_page("https://c.example").html, "<p>c</p>")
+
+    def test_expired_page_refetched(self):
+        """Test that pages older than the TTL are no longer served."""
+        self.agent._store_html("https://a.example", "<p>a</p>")
+        self.agent.page_cache_ttl = -1
+        self.assertIsNone(self.agent._cached_page("https://a.example"))
+        self.assertNotIn("https://a.example", self.agent._page_cache)
+
+    async def _parse(self, url):
+        page = self.agent._cached_page(url)
+        return await self.agent._get_parsed_page(url, page.html)
+
+    def test_parse_replaced_with_html(self):
+        """Test that a parsed page is reused until its page is fetched again."""
+        self.agent._store_html("https://a.example", "<p>Old</p>")
+        parsed = asyncio.run(self._parse("https://a.example"))
+        self.assertIs(asyncio.run(self._parse("https://a.example")), parsed)
+        self.assertEqual(parsed.text, "old")
+
+        self.agent._store_html("https://a.example", "<p>New</p>")
+        self.assertIsNone(self.agent._page_cache["https://a.example"].parsed)
+        self.assertEqual(asyncio.run(self._parse("https://a.example")).soup.get_text(), "New")
+
+if __name__ == "__main__":
+    unittest.main()
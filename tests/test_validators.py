@@ -0,0 +1,21 @@
+import unittest
+from agents._validators import NAMING_VALIDATORS
+
+class TestNamingValidators(unittest.TestCase):
+    def test_conventions(self):
+        """Test each naming convention against matching and non-matching names."""
+        cases = {
+            "PascalCase": (["Button", "UserCard"], ["button", "User_Card", ""]),
+            "camelCase": (["button", "userCard"], ["Button", "user_card", ""]),
+            "kebab-case": (["user-card"], ["usercard", "User-Card", "user_card"]),
+            "snake_case": (["user_card"], ["usercard", "User_Card", "user-card"])
+        }
+        for convention, (valid, invalid) in cases.items():
+            validator = NAMING_VALIDATORS[convention]
+            for name in valid:
+                self.assertTrue(validator(name), f"{convention}: {name}")
+            for name in invalid:
+                self.assertFalse(validator(name), f"{convention}: {name}")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from agents.orchestrator import OrchestratorAgent, WorkflowError
+
+class TestWorkflowPlan(unittest.TestCase):
+    def setUp(self):
+        """Set up an orchestrator agent with inline workflows."""
+        self.agent = OrchestratorAgent({})
+        self.agent.workflows = {
+            "sequential": {"steps": [
+                {"type": "create_component"},
+                {"type": "review_code"}
+            ]},
+            "parallel": {"steps": [
+                {"type": "create_component", "id": "header", "depends_on": []},
+                {"type": "create_component", "id": "footer", "depends_on": []},
+                {"type": "review_code", "depends_on": ["header", "footer"]}
+            ]},
+            "cyclic": {"steps": [
+                {"type": "create_component", "id": "a", "depends_on": ["b"]},
+                {"type": "create_component", "id": "b", "depends_on": ["a"]}
+            ]}
+        }
+
+    def test_steps_without_dependencies_stay_sequential(self):
+        """Test that undeclared dependencies keep the listed order."""
+        layers = self.agent._plan_workflow("sequential")
+        self.assertEqual([[step["type"] for step in layer] for layer in layers],
+                         [["create_component"], ["review_code"]])
+
+    def test_independent_steps_share_a_layer(self):
+        """Test that steps with no shared dependencies are grouped together."""
+        layers = self.agent._plan_workflow("parallel")
+        self.assertEqual([[step.get("id", step["type"]) for step in layer] for layer in layers],
+                         [["header", "footer"], ["review_code"]])
+
+    def test_shared_type_dependency(self):
+        """Test that a step depending on its own type waits for the other steps of that type."""
+        self.agent.workflows["rereview"] = {"steps": [
+            {"type": "create_component"},
+            {"type": "review_code"},
+            {"type": "review_code", "depends_on": ["review_code"]}
+        ]}
+        layers = self.agent._plan_workflow("rereview")
+        self.assertEqual([[step["type"] for step in layer] for layer in layers],
+                         [["create_component"], ["review_code"], ["review_code"]])
+
+    def test_self_dependency_rejected(self):
+        """Test that a step naming only itself as a dependency raises a workflow error."""
+        self.agent.workflows["self"] = {"steps": [
+            {"type": "create_component", "id": "a", "depends_on": ["a"]}
+        ]}
+        with self.assertRaisesRegex(WorkflowError, "depends on itself"):
+            self.agent._plan_workflow("self")
+
+    def test_cycle_rejected(self):
+        """Test that cyclic dependencies raise a workflow error."""
+        with self.assertRaises(WorkflowError):
+            self.agent._plan_workflow("cyclic")
+
+    def test_plans_are_cached_until_redefined(self):
+        """Test that a workflow is only planned again once its definition is replaced."""
+        layers = self.agent._plan_workflow("parallel")
+        self.assertIs(self.agent._plan_workflow("parallel"), layers)
+
+        with self.assertRaises(WorkflowError):
+            self.agent._plan_workflow("cyclic")
+        with self.assertRaises(WorkflowError):
+            self.agent._plan_workflow("cyclic")
+        self.agent.workflows["cyclic"] = {"steps": [
+            {"type": "create_component", "id": "a", "depends_on": []},
+            {"type": "create_component", "id": "b", "depends_on": ["a"]}
+        ]}
+        layers = self.agent._plan_workflow("cyclic")
+        self.assertEqual([[step["id"] for step in layer] for layer in layers], [["a"], ["b"]])
+
+    def test_config_without_tree_focus_kept(self):
+        """Test that a passed config is used even when it only defines workflows."""
+        workflows = {"only": {"steps": [{"type": "review_code"}]}}
+        agent = OrchestratorAgent({"workflows": workflows})
+        self.assertIs(agent.workflows, workflows)
+        self.assertIs(agent.developer.config, agent.config)
+        self.assertIs(agent.reviewer.config, agent.config)
+
+if __name__ == "__main__":
+    unittest.main()